@@ -1,282 +1,982 @@
-import time
-import random
-from typing import List, Optional
-from collections import deque
-import matplotlib.pyplot as plt
-
-# For single queue
-waiting_processes_single_queue = deque()
-
-class Process:
-    def __init__(self, size: int, process_id: int, time_needed: float):
-        self.process_id = process_id
-        self.size = size
-        self.size_on_memory = 0
-        self.partition: Optional["Partition"] = None
-        self.time_needed = time_needed
-        self.waiting_time = 0.0
-
-    def enter_into_partition(self, partition: "Partition"):
-        self.partition = partition
-        self.size_on_memory = min(partition.size, self.size)
-
-    def exit_from_partition(self):
-        self.partition = None
-        self.size_on_memory = 0
-
-
-class Partition:
-    def __init__(self, size: int, partition_id: int):
-        self.partition_id = partition_id
-        self.size = size
-        self.currently_occupied = 0
-        self.process: Optional[Process] = None
-        self.waiting_processes: List[Process] = []
-
-    def add_new_process(self, process: Process, use_single_queue=False):
-        if self.process is None:
-            self.process = process
-            self.currently_occupied = min(process.size, self.size)
-            process.enter_into_partition(self)
-        else:
-            if use_single_queue:
-                waiting_processes_single_queue.append(process)
-            else:
-                self.waiting_processes.append(process)
-
-    def remove_current_process(self, use_single_queue=False):
-        if self.process:
-            self.process.exit_from_partition()
-            self.process = None
-            self.currently_occupied = 0
-            if use_single_queue:
-                if waiting_processes_single_queue:
-                    next_process = waiting_processes_single_queue.popleft()
-                    self.add_new_process(next_process, use_single_queue)
-            else:
-                if self.waiting_processes:
-                    next_process = self.waiting_processes.pop(0)
-                    self.add_new_process(next_process)
-
-    def get_queue(self) -> List[Process]:
-        return self.waiting_processes
-
-
-def generate_random_processes(process_count: int):
-    processes = []
-    for i in range(process_count):
-        size = random.randint(10, 100)  # Random size between 10MB and 100MB
-        time_needed = random.uniform(1, 10)  # Random time needed between 1 and 10 seconds
-        processes.append(Process(size, i + 1, time_needed))
-    return processes
-
-
-def generate_random_partitions(partition_count: int, memory_size: int):
-    partitions = []
-    total_size = 0
-    for i in range(partition_count):
-        remaining_memory = memory_size - total_size
-        if remaining_memory <= 0:
-            break
-        size = random.randint(10, remaining_memory // (partition_count - i))  # Random size ensuring total size <= memory_size
-        total_size += size
-        partitions.append(Partition(size, i + 1))
-    return partitions, total_size
-
-
-def best_fit_allocation(processes: List[Process], partitions: List[Partition], use_single_queue=False):
-    partitions.sort(key=lambda x: x.size)
-
-    for process in processes:
-        placed = False
-        for partition in partitions:
-            if process.size <= partition.size:
-                if partition.process is None:
-                    partition.add_new_process(process, use_single_queue)
-                    placed = True
-                    break
-                elif not use_single_queue:
-                    partition.add_new_process(process, use_single_queue)
-                    placed = True
-                    break
-        if not placed and use_single_queue:
-            waiting_processes_single_queue.append(process)
-
-
-def simulate_execution(partitions: List[Partition], use_single_queue=False):
-    start_time = time.time()
-    total_execution_time = 0.0
-    total_waiting_time = 0.0
-
-    while any(partition.process or partition.waiting_processes for partition in partitions) or (use_single_queue and waiting_processes_single_queue):
-        for partition in partitions:
-            if partition.process:
-                process_time_needed = partition.process.time_needed
-                waiting_time_before_execution = partition.process.waiting_time
-                print(f"Executing Process P{partition.process.process_id} in Partition {partition.partition_id} for {process_time_needed} seconds.")
-                time.sleep(process_time_needed)
-                partition.remove_current_process(use_single_queue)
-                total_execution_time += process_time_needed
-                total_waiting_time += waiting_time_before_execution
-
-        # Update waiting time for processes in queue
-        for partition in partitions:
-            if partition.process:
-                for process in partition.get_queue():
-                    process.waiting_time += partition.process.time_needed
-
-        if use_single_queue:
-            for process in waiting_processes_single_queue:
-                process.waiting_time += process_time_needed
-
-    end_time = time.time()
-    total_running_time = end_time - start_time
-
-    return total_execution_time, total_running_time, total_waiting_time
-
-
-def plot_comparison(single_queue_data, multi_queue_data):
-    labels = ['Total Execution Time', 'Total Running Time', 'Total Waiting Time', 'Time Utilization']
-
-    single_queue_values = [single_queue_data['execution_time'], single_queue_data['running_time'], single_queue_data['waiting_time'], single_queue_data['utilization']]
-    multi_queue_values = [multi_queue_data['execution_time'], multi_queue_data['running_time'], multi_queue_data['waiting_time'], multi_queue_data['utilization']]
-
-    x = range(len(labels))
-    width = 0.35
-
-    fig, ax = plt.subplots()
-    ax.bar(x, single_queue_values, width, label='Single Queue')
-    ax.bar([p + width for p in x], multi_queue_values, width, label='Multi Queue')
-
-    ax.set_xlabel('Metrics')
-    ax.set_ylabel('Values')
-    ax.set_title('Comparison of Single Queue and Multi Queue')
-    ax.set_xticks([p + width / 2 for p in x])
-    ax.set_xticklabels(labels)
-    ax.legend()
-
-    plt.show()
-
-
-def main():
-    memory_size = int(input("Please Enter the Memory Size (MB): "))
-    partition_count = int(input("Please Enter the partition count: "))
-    process_count = random.randint(10, 20)  # Random process count between 10 and 20
-
-    processes = generate_random_processes(process_count)
-    partitions, total_partition_size = generate_random_partitions(partition_count, memory_size)
-
-    print(f"\nGenerated {process_count} processes:")
-    for process in processes:
-        print(f"Process {process.process_id}: Size = {process.size}MB, Time Needed = {process.time_needed:.2f} seconds")
-
-    print(f"\nGenerated {partition_count} partitions:")
-    for partition in partitions:
-        print(f"Partition {partition.partition_id}: Size = {partition.size}MB")
-
-    if total_partition_size > memory_size:
-        print("Error! Total size of partitions is bigger than Memory size!")
-        return
-
-    # Multi-queue simulation
-    print("\nSimulation with Multiple Queues:")
-    best_fit_allocation(processes, partitions)
-    total_used = sum(partition.currently_occupied for partition in partitions)
-    total_execution_time, total_running_time, total_waiting_time = simulate_execution(partitions)
-
-    time_utilization = (total_execution_time / (total_running_time + total_waiting_time)) * 100 if (total_running_time + total_waiting_time) != 0 else 0
-
-    multi_queue_data = {
-        'execution_time': total_execution_time,
-        'running_time': total_running_time,
-        'waiting_time': total_waiting_time,
-        'utilization': time_utilization
-    }
-
-    print("\nProcesses are placed on memory")
-    print("---------- Memory Information (Multi-Queue) ----------")
-    print(f"Memory Size: {memory_size}MB")
-    print(f"Used Size: {total_used}MB")
-    print(f"Remaining Size: {memory_size - total_used}MB")
-    print(f"Utilization: {(total_used / memory_size) * 100:.2f}%")
-    print(f"Total Time Needed for Processes: {total_execution_time:.2f} seconds")
-    print(f"Total Running Time of Application: {total_running_time:.2f} seconds")
-    print(f"Total Waiting Time: {total_waiting_time:.2f} seconds")
-    print(f"Time Utilization: {time_utilization:.2f}%")
-
-    for i, partition in enumerate(partitions):
-        print(f"\n---- Partition {i + 1}:")
-        print(f"Size: {partition.size}MB")
-        if partition.process:
-            print(f"Current Process: P{partition.process.process_id}")
-            print(f"Process Size: {partition.process.size}MB")
-            print(f"Time Needed: {partition.process.time_needed} seconds")
-        else:
-            print("Current Process: NONE")
-
-        print(f"Queue for Partition {i + 1}:")
-        queue = partition.get_queue()
-        if queue:
-            for proc in queue:
-                print(f"- Process P{proc.process_id} - Time Needed: {proc.time_needed} seconds")
-        else:
-            print("Empty")
-
-    # Single queue simulation
-    print("\nSimulation with Single Queue:")
-    for partition in partitions:
-        partition.process = None
-        partition.waiting_processes = []
-
-    best_fit_allocation(processes, partitions, use_single_queue=True)
-    total_used = sum(partition.currently_occupied for partition in partitions)
-    total_execution_time, total_running_time, total_waiting_time = simulate_execution(partitions, use_single_queue=True)
-
-    time_utilization = (total_execution_time / (total_running_time + total_waiting_time)) * 100 if (total_running_time + total_waiting_time) != 0 else 0
-
-    single_queue_data = {
-        'execution_time': total_execution_time,
-        'running_time': total_running_time,
-        'waiting_time': total_waiting_time,
-        'utilization': time_utilization
-    }
-
-    print("\nProcesses are placed on memory")
-    print("---------- Memory Information (Single Queue) ----------")
-    print(f"Memory Size: {memory_size}MB")
-    print(f"Used Size: {total_used}MB")
-    print(f"Remaining Size: {memory_size - total_used}MB")
-    print(f"Utilization: {(total_used / memory_size) * 100:.2f}%")
-    print(f"Total Time Needed for Processes: {total_execution_time:.2f} seconds")
-    print(f"Total Running Time of Application: {total_running_time:.2f} seconds")
-    print(f"Total Waiting Time: {total_waiting_time:.2f} seconds")
-    print(f"Time Utilization: {time_utilization:.2f}%")
-
-    for i, partition in enumerate(partitions):
-        print(f"\n---- Partition {i + 1}:")
-        print(f"Size: {partition.size}MB")
-        if partition.process:
-            print(f"Current Process: P{partition.process.process_id}")
-            print(f"Process Size: {partition.process.size}MB")
-            print(f"Time Needed: {partition.process.time_needed} seconds")
-        else:
-            print("Current Process: NONE")
-
-    print("\nShared Waiting Queue: ", end="")
-    if not waiting_processes_single_queue:
-        print("[]")
-    else:
-        print("[", end="")
-        for j, proc in enumerate(waiting_processes_single_queue):
-            if j != len(waiting_processes_single_queue) - 1:
-                print(f"P{proc.process_id} - ", end="")
-            else:
-                print(f"P{proc.process_id}]", end="")
-        print()
-
-    # Plot comparison
-    plot_comparison(single_queue_data, multi_queue_data)
-
-
-if __name__ == "__main__":
-    main()
+import contextlib
+import functools
+import heapq
+import itertools
+import os
+import threading
+import time
+import random
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from array import array
+from collections import deque
+
+from buddy import BuddyAllocator
+from dynamic_memory import VariablePartitioning
+from event_log import DEBUG, INFO, LEVELS, ConsoleLog, EventLog
+from fitting_queue import FittingQueue
+from partition_index import PLACEMENT_POLICIES, PartitionIndex
+from swap import SwapTier
+
+
+class Process:
+    __slots__ = ("process_id", "size", "size_on_memory", "partition", "time_needed", "waiting_time", "arrival_time",
+                 "enqueue_time", "start_time", "finish_time", "resident_size", "swapped_size")
+
+    def __init__(self, size: int, process_id: int, time_needed: float, arrival_time: float = 0.0):
+        self.process_id = process_id
+        self.size = size
+        self.size_on_memory = 0
+        self.partition: Optional["Partition"] = None
+        self.time_needed = time_needed
+        self.waiting_time = 0.0
+        self.arrival_time = arrival_time
+        # When the process was admitted; its wait is the start time minus this
+        self.enqueue_time = arrival_time
+        self.start_time: Optional[float] = None
+        self.finish_time: Optional[float] = None
+        # The part kept in memory and the part kept in the swap tier; only
+        # processes larger than any partition have a swapped part
+        self.resident_size = size
+        self.swapped_size = 0
+
+    def enter_into_partition(self, partition: "Partition"):
+        self.partition = partition
+        self.size_on_memory = min(partition.size, self.resident_size)
+
+    def exit_from_partition(self):
+        self.partition = None
+        self.size_on_memory = 0
+
+    def copy(self) -> "Process":
+        process = Process(self.size, self.process_id, self.time_needed, self.arrival_time)
+        process.resident_size = self.resident_size
+        process.swapped_size = self.swapped_size
+        return process
+
+
+class Partition:
+    __slots__ = ("partition_id", "size", "currently_occupied", "process", "waiting_processes", "index", "index_position",
+                 "quantum")
+
+    def __init__(self, size: int, partition_id: int):
+        self.partition_id = partition_id
+        self.size = size
+        self.currently_occupied = 0
+        self.process: Optional[Process] = None
+        self.waiting_processes: Deque[Process] = deque()
+        # Set by the PartitionIndex that tracks this partition, if any
+        self.index = None
+        self.index_position = -1
+        # Longest a process runs before it can be preempted, or None to run
+        # processes to completion
+        self.quantum: Optional[float] = None
+
+    # queue is the simulation's queue strategy; without one the partition uses
+    # its own waiting queue, as in multi-queue mode.
+    def add_new_process(self, process: Process, queue: Optional["MultiQueue"] = None):
+        if self.process is None:
+            self.process = process
+            self.currently_occupied = min(process.resident_size, self.size)
+            process.enter_into_partition(self)
+            if self.index is not None:
+                self.index.mark_busy(self)
+        elif queue is None:
+            self.waiting_processes.append(process)
+        else:
+            queue.enqueue(self, process)
+
+    def remove_current_process(self, queue: Optional["MultiQueue"] = None):
+        if self.process:
+            self.process.exit_from_partition()
+            self.process = None
+            self.currently_occupied = 0
+            if self.index is not None:
+                self.index.mark_free(self)
+            if queue is None:
+                next_process = self.waiting_processes.popleft() if self.waiting_processes else None
+            else:
+                next_process = queue.next_process(self)
+            if next_process is not None:
+                self.add_new_process(next_process, queue)
+
+    def get_queue(self) -> Deque[Process]:
+        return self.waiting_processes
+
+    def copy(self) -> "Partition":
+        return Partition(self.size, self.partition_id)
+
+
+# Queue strategies. Each simulation owns its strategy instance, so there is no
+# state shared between simulations.
+class MultiQueue:
+    use_single_queue = False
+    # Kept current by the simulation, for strategies that look at how long
+    # processes have waited
+    clock = 0.0
+
+    def place(self, process: Process, policy: PartitionIndex) -> Optional[Partition]:
+        # Queue on the chosen partition even when it is busy
+        return policy.find(process.resident_size)
+
+    def enqueue(self, partition: Partition, process: Process):
+        partition.waiting_processes.append(process)
+
+    def enqueue_unplaced(self, process: Process):
+        # No partition is large enough, so the process is never run
+        pass
+
+    def next_process(self, partition: Partition) -> Optional[Process]:
+        if partition.waiting_processes:
+            return partition.waiting_processes.popleft()
+        return None
+
+    def waiting(self, partitions: List[Partition]) -> Iterator[Process]:
+        for partition in partitions:
+            yield from partition.get_queue()
+
+
+class SingleQueue(MultiQueue):
+    use_single_queue = True
+
+    def __init__(self):
+        self.waiting_processes: Deque[Process] = deque()
+
+    def place(self, process: Process, policy: PartitionIndex) -> Optional[Partition]:
+        # Only free partitions take a process directly; the rest share one queue
+        return policy.find_free(process.resident_size)
+
+    def enqueue(self, partition: Partition, process: Process):
+        self.waiting_processes.append(process)
+
+    def enqueue_unplaced(self, process: Process):
+        self.waiting_processes.append(process)
+
+    def next_process(self, partition: Partition) -> Optional[Process]:
+        if self.waiting_processes:
+            return self.waiting_processes.popleft()
+        return None
+
+    # Used with dynamic placement: the head of the queue, if it fits in capacity
+    def next_fitting(self, capacity: int) -> Optional[Process]:
+        if self.waiting_processes and self.waiting_processes[0].resident_size <= capacity:
+            return self.waiting_processes.popleft()
+        return None
+
+    def waiting(self, partitions: List[Partition]) -> Iterator[Process]:
+        return iter(self.waiting_processes)
+
+
+# Single queue that hands a freed partition the largest (dispatch="largest") or
+# oldest (dispatch="oldest") waiting process that fits it, instead of the head
+# of the queue whether it fits or not. A process that has waited at least
+# aging_threshold seconds is taken first by any partition it fits, so large
+# processes are not starved by a stream of smaller ones.
+class FittingSingleQueue(SingleQueue):
+    def __init__(self, dispatch="largest", aging_threshold: Optional[float] = 30.0):
+        self.waiting_processes = FittingQueue()
+        self.dispatch = dispatch
+        self.aging_threshold = aging_threshold
+
+    def next_process(self, partition: Partition) -> Optional[Process]:
+        return self.next_fitting(partition.size)
+
+    def next_fitting(self, capacity: int) -> Optional[Process]:
+        queue = self.waiting_processes
+        if self.dispatch == "oldest":
+            return queue.pop_oldest_fitting(capacity)
+        # The oldest process overall has waited longest, so unless it has
+        # aged no process has
+        oldest = queue.oldest()
+        if (self.aging_threshold is not None and oldest is not None
+                and self.clock - oldest.enqueue_time >= self.aging_threshold):
+            oldest = queue.oldest_fitting(capacity)
+            if oldest is not None and self.clock - oldest.enqueue_time >= self.aging_threshold:
+                return queue.pop_oldest_fitting(capacity)
+        return queue.pop_largest_fitting(capacity)
+
+
+def buddy_placement(memory_size: int):
+    return functools.partial(BuddyAllocator, memory_size=memory_size, partition_type=Partition)
+
+
+def variable_placement(memory_size: int):
+    return functools.partial(VariablePartitioning, memory_size=memory_size, partition_type=Partition)
+
+
+def generate_random_processes(process_count: int, rng=random):
+    processes = []
+    for i in range(process_count):
+        size = rng.randint(10, 100)  # Random size between 10MB and 100MB
+        time_needed = rng.uniform(1, 10)  # Random time needed between 1 and 10 seconds
+        processes.append(Process(size, i + 1, time_needed))
+    return processes
+
+
+# Online workloads: generators of processes with increasing arrival times, to be
+# passed to Simulation.simulate_execution(arrivals=...).
+def generate_poisson_arrivals(process_count: int, arrival_rate: float, rng=random) -> Iterator[Process]:
+    arrival_time = 0.0
+    for i in range(process_count):
+        arrival_time += rng.expovariate(arrival_rate)  # Exponential gaps, arrival_rate processes per second
+        size = rng.randint(10, 100)
+        time_needed = rng.uniform(1, 10)
+        yield Process(size, i + 1, time_needed, arrival_time)
+
+
+def generate_bursty_arrivals(process_count: int, arrival_rate: float, mean_burst_size: int = 5, rng=random) -> Iterator[Process]:
+    # Bursts arrive as a Poisson process and bring 1 to 2 * mean_burst_size - 1
+    # processes at once, keeping the same mean arrival_rate
+    arrival_time = 0.0
+    i = 0
+    while i < process_count:
+        arrival_time += rng.expovariate(arrival_rate / mean_burst_size)
+        for _ in range(min(rng.randint(1, 2 * mean_burst_size - 1), process_count - i)):
+            size = rng.randint(10, 100)
+            time_needed = rng.uniform(1, 10)
+            i += 1
+            yield Process(size, i, time_needed, arrival_time)
+
+
+def generate_random_partitions(partition_count: int, memory_size: int, rng=random):
+    partitions = []
+    total_size = 0
+    for i in range(partition_count):
+        remaining_memory = memory_size - total_size
+        if remaining_memory <= 0:
+            break
+        size = rng.randint(10, remaining_memory // (partition_count - i))  # Random size ensuring total size <= memory_size
+        total_size += size
+        partitions.append(Partition(size, i + 1))
+    return partitions, total_size
+
+
+# placement is a policy class from partition_index (best fit by default), or any
+# callable that builds a policy from the partitions list, such as
+# buddy_placement(memory_size) or variable_placement(memory_size). Dynamic
+# policies also record an external fragmentation timeline of (time, value).
+# instrumentation, if given, is an instrumentation.Instrumentation that records
+# occupancy, queue length and fragmentation timelines of the discrete-event run.
+# Executed processes are reported to event_log (an event_log.EventLog); without
+# one, verbose runs print them to the console. swap, if given, is a
+# swap.SwapTier: processes larger than any partition are then admitted with
+# their excess in swap, and each of their runs is lengthened by paging it in
+# and out. disciplines, if given, is a scheduling.Discipline for every fixed
+# partition, or a dict of them by partition_id, choosing how each partition
+# orders its waiting queue and whether it preempts processes. With a single
+# queue only the quantum applies, so ordering disciplines are rejected. profiler, if
+# given, is a profiling.Profiler that times and counts the placement, queue
+# and execution phases.
+class Simulation:
+    def __init__(self, partitions: List[Partition], queue: Optional[MultiQueue] = None, placement=PartitionIndex,
+                 instrumentation=None, event_log: Optional[EventLog] = None, swap=None, disciplines=None,
+                 profiler=None):
+        self.partitions = partitions
+        self.queue = queue if queue is not None else MultiQueue()
+        self.placement = placement
+        self.instrumentation = instrumentation
+        self.event_log = event_log
+        self.swap = swap
+        self.disciplines = disciplines
+        self.profiler = profiler
+        self.policy = None
+        # Largest process memory can hold, set with the policy
+        self.max_process_size = 0
+        self.clock = 0.0
+        self.completed = 0
+        self.preemptions = 0
+        # Run time still owed by the processes a quantum cut short, and those
+        # of them that were preempted and have not run since. Kept here rather
+        # than on every Process, as only round-robin uses them.
+        self.remaining_times: Dict[Process, float] = {}
+        self.preempted: Set[Process] = set()
+        self.fragmentation: List[Tuple[float, float]] = []
+        # Waiting time of every started process until its first start, in
+        # start order
+        self.waiting_times = array("d")
+
+    def _event_logs(self, verbose: bool) -> Tuple[Optional[EventLog], Optional[EventLog]]:
+        # The logs to report starts and finishes to, or None for each when that
+        # level is off, so the event loop pays a single check per event
+        log = self.event_log
+        if log is None and verbose:
+            log = ConsoleLog()
+        if log is None:
+            return None, None
+        return (log if log.enabled(INFO) else None), (log if log.enabled(DEBUG) else None)
+
+    def waiting_processes(self) -> Iterator[Process]:
+        return self.queue.waiting(self.partitions)
+
+    def concurrency(self) -> int:
+        # How many processes could run at once: every fixed partition, or the
+        # most partitions a dynamic policy had allocated
+        if self.policy is not None and self.policy.dynamic:
+            return self.policy.peak_partitions
+        return len(self.partitions)
+
+    def setup(self):
+        if self.policy is None:
+            self.partitions.sort(key=lambda x: x.size)
+            self.policy = self.placement(self.partitions)
+            if self.disciplines is not None and self.queue.use_single_queue:
+                disciplines = self.disciplines.values() if isinstance(self.disciplines, dict) else [self.disciplines]
+                # A shared queue keeps its own order; only quanta apply to it
+                if any(discipline.key is not None for discipline in disciplines):
+                    raise ValueError("Queue-ordering disciplines need a queue per partition (multi-queue mode)")
+            if self.policy.dynamic:
+                if self.disciplines is not None:
+                    raise ValueError("Scheduling disciplines need fixed partitions")
+                self.max_process_size = self.policy.largest_free()
+            else:
+                self.max_process_size = self.partitions[-1].size if self.partitions else 0
+            if self.disciplines is not None:
+                for partition in self.partitions:
+                    discipline = self.disciplines
+                    if isinstance(discipline, dict):
+                        discipline = discipline.get(partition.partition_id)
+                        if discipline is None:
+                            continue
+                    partition.waiting_processes = discipline.queue()
+                    partition.quantum = discipline.quantum
+            if self.profiler is not None:
+                self.profiler.attach(self.policy)
+
+    def place(self, process: Process) -> Optional[Partition]:
+        if self.profiler is not None:
+            started = time.perf_counter()
+        process.enqueue_time = self.clock
+        if self.swap is not None and 0 < self.max_process_size < process.size:
+            # Only what fits stays resident
+            process.resident_size = self.max_process_size
+            process.swapped_size = process.size - self.max_process_size
+            self.swap.admit()
+        partition = self.queue.place(process, self.policy)
+        if partition is not None:
+            partition.add_new_process(process, self.queue)
+        else:
+            self.queue.enqueue_unplaced(process)
+        if self.profiler is not None:
+            # Multi-queue mode drops processes no partition can hold
+            queued = partition.process is not process if partition is not None else self.queue.use_single_queue
+            self.profiler.placed(queued, time.perf_counter() - started)
+        return partition
+
+    def allocate(self, processes: Iterable[Process]):
+        self.setup()
+        if self.profiler is not None:
+            with self.profiler.profiling():
+                for process in processes:
+                    self.place(process)
+            return
+        for process in processes:
+            self.place(process)
+
+    def run_time(self, process: Process, work: float) -> float:
+        # How long a run of work seconds occupies its partition, including
+        # swap transfers
+        duration = work
+        if self.swap is not None and process.swapped_size:
+            duration += self.swap.page(process.swapped_size)
+        if self.preempted and process in self.preempted:
+            self.preempted.discard(process)
+            if self.swap is not None:
+                # The image written out at preemption is read back in
+                duration += self.swap.transfer(process.resident_size) + self.swap.transfer(process.resident_size)
+        return duration
+
+    def preempt(self, partition: Partition) -> List[Partition]:
+        # Queues the partition's process again behind the waiting ones and
+        # returns the partitions that started a process as a result, which
+        # may include this one taking the same process back
+        process = partition.process
+        process.enqueue_time = self.clock
+        self.queue.enqueue(partition, process)
+        if self.profiler is not None:
+            self.profiler.pushed()
+        started = self.release(partition)
+        if process.partition is None:
+            self.preempted.add(process)
+            self.preemptions += 1
+        return started
+
+    def release(self, partition: Partition) -> List[Partition]:
+        # Finishes the partition's process and returns the partitions that
+        # started a new process as a result
+        if self.profiler is None:
+            return self._release(partition)
+        started = time.perf_counter()
+        partitions = self._release(partition)
+        # Every process started here comes off a queue, and dynamic placement
+        # places it as well
+        self.profiler.popped(len(partitions), time.perf_counter() - started, self.policy.dynamic)
+        return partitions
+
+    def _release(self, partition: Partition) -> List[Partition]:
+        if not self.policy.dynamic:
+            partition.remove_current_process(self.queue)
+            return [partition] if partition.process else []
+
+        # Dynamic placement frees the memory itself, which may now hold one or
+        # more waiting processes
+        partition.remove_current_process()
+        started = []
+        while True:
+            process = self.queue.next_fitting(self.policy.largest_free())
+            if process is None:
+                return started
+            new_partition = self.policy.find_free(process.resident_size)
+            new_partition.add_new_process(process, self.queue)
+            started.append(new_partition)
+
+    # arrivals is an optional iterable of processes sorted by arrival_time, such
+    # as a trace reader. Each one is admitted and placed only when the virtual
+    # clock reaches its arrival, so the stream is never held in memory.
+    # checkpoint, if given, is a checkpoint.Checkpointer that snapshots the run
+    # as it goes; resume is the engine state of such a snapshot, passed by
+    # checkpoint.resume() to continue the run from it.
+    def simulate_execution(self, real_time=False, verbose=True, arrivals: Optional[Iterable[Process]] = None,
+                           time_scale: float = 1.0, checkpoint=None, resume: Optional[dict] = None):
+        if real_time:
+            if arrivals is not None or checkpoint is not None:
+                raise ValueError("Real-time replay does not support arrivals or checkpoints")
+            run = functools.partial(self.simulate_execution_real_time, verbose, time_scale)
+        else:
+            run = functools.partial(self.simulate_events, verbose, arrivals, checkpoint, resume)
+        if self.profiler is None:
+            return run()
+
+        # The execution phase is the run minus the placement and queue time
+        # spent in it
+        profiler = self.profiler
+        nested = profiler.times["placement"] + profiler.times["queue"]
+        started = time.perf_counter()
+        with profiler.profiling():
+            totals = run()
+        nested = profiler.times["placement"] + profiler.times["queue"] - nested
+        profiler.times["execution"] += time.perf_counter() - started - nested
+        return totals
+
+    def simulate_events(self, verbose=True, arrivals: Optional[Iterable[Process]] = None, checkpoint=None,
+                        resume: Optional[dict] = None):
+        self.setup()
+
+        # Discrete-event simulation: partitions run concurrently on a virtual clock,
+        # and the heap holds one completion event per busy partition. Waiting
+        # time is the start time minus the enqueue time, so no event has to
+        # touch the queued processes.
+        if resume is None:
+            self.clock = self.queue.clock = 0.0
+            total_execution_time = 0.0
+            total_waiting_time = 0.0
+            events = []
+            # Breaks ties between simultaneous completions in start order
+            sequence = itertools.count()
+            arrivals_read = 0
+            self.completed = 0
+            self.preemptions = 0
+            self.remaining_times = {}
+            self.preempted = set()
+            self.fragmentation = []
+            self.waiting_times = array("d")
+        else:
+            total_execution_time = resume["total_execution_time"]
+            total_waiting_time = resume["total_waiting_time"]
+            events = resume["events"]
+            sequence = itertools.count(resume["sequence"])
+            arrivals_read = resume["arrivals_read"]
+        track_fragmentation = self.policy.dynamic
+        instrumentation = self.instrumentation
+        start_log, finish_log = self._event_logs(verbose)
+
+        def start_process(partition: Partition):
+            # Starts or resumes the partition's process for its remaining time,
+            # or for at most the partition's quantum
+            nonlocal total_waiting_time
+            process = partition.process
+            waiting_time = self.clock - process.enqueue_time
+            process.waiting_time += waiting_time
+            total_waiting_time += waiting_time
+            if process.start_time is None:
+                if start_log is not None:
+                    start_log.write(["start", self.clock, process.process_id, partition.partition_id, process.time_needed])
+                process.start_time = self.clock
+                self.waiting_times.append(waiting_time)
+            work = process.time_needed
+            if self.remaining_times:
+                work = self.remaining_times.get(process, work)
+            if partition.quantum is not None and partition.quantum < work:
+                work = partition.quantum
+            heapq.heappush(events, (self.clock + self.run_time(process, work), next(sequence), partition, work))
+
+        arrivals = iter(arrivals if arrivals is not None else ())
+        if resume is None:
+            for partition in self.partitions:
+                if partition.process:
+                    start_process(partition)
+            if track_fragmentation:
+                self.fragmentation.append((self.clock, self.policy.external_fragmentation()))
+            if checkpoint is not None:
+                checkpoint.start(self)
+            next_arrival = next(arrivals, None)
+            arrivals_read += next_arrival is not None
+        else:
+            # The arrivals read before the snapshot, including the one read
+            # ahead of the clock, come from the snapshot
+            for _ in itertools.islice(arrivals, arrivals_read):
+                pass
+            next_arrival = resume["next_arrival"]
+        if instrumentation is not None:
+            instrumentation.start(self, self.clock)
+
+        while events or next_arrival is not None:
+            # Completions at the same time as an arrival are handled first, so
+            # the arrival can use the memory they free
+            if next_arrival is not None and (not events or next_arrival.arrival_time < events[0][0]):
+                if next_arrival.arrival_time < self.clock:
+                    raise ValueError(f"Arrivals must be sorted by arrival time (P{next_arrival.process_id})")
+                self.clock = self.queue.clock = next_arrival.arrival_time
+                partition = self.place(next_arrival)
+                if partition is not None and partition.process is next_arrival:
+                    start_process(partition)
+                next_arrival = next(arrivals, None)
+                arrivals_read += next_arrival is not None
+                touched = [partition] if partition is not None else []
+            else:
+                finish_time, _, partition, work = heapq.heappop(events)
+                self.clock = self.queue.clock = finish_time
+                process = partition.process
+
+                total_execution_time += work
+                remaining = process.time_needed
+                if self.remaining_times:
+                    remaining = self.remaining_times.pop(process, remaining)
+                if work < remaining:
+                    # The quantum ran out
+                    self.remaining_times[process] = remaining - work
+                    started = self.preempt(partition)
+                    if finish_log is not None and process in self.preempted:
+                        finish_log.write(["preempt", self.clock, process.process_id, partition.partition_id])
+                else:
+                    process.finish_time = self.clock
+                    self.completed += 1
+                    if finish_log is not None:
+                        finish_log.write(["finish", self.clock, process.process_id, partition.partition_id])
+                    started = self.release(partition)
+                for started_partition in started:
+                    start_process(started_partition)
+                touched = [partition] + started
+            if track_fragmentation:
+                self.fragmentation.append((self.clock, self.policy.external_fragmentation()))
+            if instrumentation is not None:
+                instrumentation.record(self.clock, touched)
+            if checkpoint is not None and checkpoint.due():
+                checkpoint.save(self, {
+                    "total_execution_time": total_execution_time,
+                    "total_waiting_time": total_waiting_time,
+                    "events": events,
+                    "sequence": next(sequence),
+                    "arrivals_read": arrivals_read,
+                    "next_arrival": next_arrival,
+                })
+
+        if checkpoint is not None:
+            checkpoint.close()
+        if instrumentation is not None:
+            instrumentation.finish(self.clock)
+        if start_log is not None:
+            start_log.flush()
+
+        # The makespan of the virtual schedule
+        total_running_time = self.clock
+
+        return total_execution_time, total_running_time, total_waiting_time
+
+    # Wall-clock replay with one worker thread per busy partition, so partitions
+    # run concurrently and the running time is the real makespan. Workers sleep
+    # through their process outside the lock; everything that touches the
+    # partitions, the queues or the totals runs under one lock. time_scale
+    # shortens (or stretches) every sleep, and the times reported are scaled
+    # back to process seconds.
+    def simulate_execution_real_time(self, verbose=True, time_scale: float = 1.0):
+        self.setup()
+        if any(partition.quantum is not None for partition in self.partitions):
+            raise ValueError("Real-time replay does not support preemptive disciplines")
+        lock = threading.Condition()
+        start_time = time.monotonic()
+        total_execution_time = 0.0
+        total_waiting_time = 0.0
+        active_workers = 0
+        # Exceptions raised in workers, re-raised by the main thread
+        errors = []
+        self.clock = self.queue.clock = 0.0
+        self.completed = 0
+        self.waiting_times = array("d")
+        instrumentation = self.instrumentation
+        start_log, finish_log = self._event_logs(verbose)
+
+        def now() -> float:
+            return (time.monotonic() - start_time) / time_scale
+
+        def start_process(partition: Partition):
+            # Called with the lock held
+            nonlocal total_waiting_time
+            process = partition.process
+            if start_log is not None:
+                start_log.write(["start", self.clock, process.process_id, partition.partition_id, process.time_needed])
+            process.start_time = self.clock
+            waiting_time = self.clock - process.enqueue_time
+            process.waiting_time += waiting_time
+            total_waiting_time += waiting_time
+            self.waiting_times.append(waiting_time)
+
+        def spawn(partition: Partition):
+            nonlocal active_workers
+            active_workers += 1
+            threading.Thread(target=worker, args=(partition,), daemon=True).start()
+
+        def worker(partition: Partition):
+            nonlocal total_execution_time, active_workers
+            # Runs the partition's processes one after another until it is idle
+            try:
+                while True:
+                    with lock:
+                        process = partition.process
+                        if process is not None:
+                            duration = self.run_time(process, process.time_needed)
+                    if process is None:
+                        break
+                    time.sleep(duration * time_scale)
+                    with lock:
+                        self.clock = self.queue.clock = now()
+                        total_execution_time += process.time_needed
+                        process.finish_time = self.clock
+                        self.completed += 1
+                        if finish_log is not None:
+                            finish_log.write(["finish", self.clock, process.process_id, partition.partition_id])
+                        started = self.release(partition)
+                        for started_partition in started:
+                            start_process(started_partition)
+                            # Dynamic placement may start processes in other partitions
+                            if started_partition is not partition:
+                                spawn(started_partition)
+                        if instrumentation is not None:
+                            instrumentation.record(self.clock, [partition] + started)
+            except BaseException as error:
+                with lock:
+                    errors.append(error)
+            finally:
+                # The main thread waits for this, so it must happen however the
+                # worker ends
+                with lock:
+                    active_workers -= 1
+                    lock.notify_all()
+
+        with lock:
+            busy = [partition for partition in self.partitions if partition.process]
+            for partition in busy:
+                start_process(partition)
+            if instrumentation is not None:
+                instrumentation.start(self, self.clock)
+            for partition in busy:
+                spawn(partition)
+            # Stop once every worker is done; waiting processes left then fit
+            # nowhere. A failed worker ends the replay.
+            while active_workers and not errors:
+                lock.wait()
+            if errors:
+                raise errors[0]
+            self.clock = self.queue.clock = now()
+            if instrumentation is not None:
+                instrumentation.finish(self.clock)
+            if start_log is not None:
+                start_log.flush()
+
+        total_running_time = self.clock
+
+        return total_execution_time, total_running_time, total_waiting_time
+
+
+# Share of the partitions' time spent executing processes. Partitions run
+# concurrently, so the capacity is the makespan times the partitions that
+# could run at once (Simulation.concurrency()); swap transfers do not count as
+# execution.
+def calculate_time_utilization(total_execution_time: float, total_running_time: float, partition_count: int) -> float:
+    if total_running_time * partition_count == 0:
+        return 0
+    return (total_execution_time / (total_running_time * partition_count)) * 100
+
+
+# Shows the comparison in a window, or with output set renders it to that file
+# through the non-interactive Agg backend. matplotlib is only imported here, so
+# runs that do not plot never load it. The optional errors are error bar
+# half-widths per metric, and names label the two strategies.
+def plot_comparison(single_queue_data, multi_queue_data, output: Optional[str] = None,
+                    single_queue_errors=None, multi_queue_errors=None, names=("Single Queue", "Multi Queue")):
+    import matplotlib
+    if output is not None:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    labels = ['Total Execution Time', 'Total Running Time', 'Total Waiting Time', 'Time Utilization']
+
+    single_queue_values = [single_queue_data['execution_time'], single_queue_data['running_time'], single_queue_data['waiting_time'], single_queue_data['utilization']]
+    multi_queue_values = [multi_queue_data['execution_time'], multi_queue_data['running_time'], multi_queue_data['waiting_time'], multi_queue_data['utilization']]
+
+    x = range(len(labels))
+    width = 0.35
+
+    fig, ax = plt.subplots()
+    ax.bar(x, single_queue_values, width, yerr=single_queue_errors, capsize=4, label=names[0])
+    ax.bar([p + width for p in x], multi_queue_values, width, yerr=multi_queue_errors, capsize=4, label=names[1])
+
+    ax.set_xlabel('Metrics')
+    ax.set_ylabel('Values')
+    ax.set_title(f'Comparison of {names[0]} and {names[1]}')
+    ax.set_xticks([p + width / 2 for p in x])
+    ax.set_xticklabels(labels)
+    ax.legend()
+
+    if output is not None:
+        fig.savefig(output, bbox_inches="tight")
+        plt.close(fig)
+    else:
+        plt.show()
+
+
+# Records the timeline of one simulation to <stem>_<name><ext> and aggregates it
+# into histograms for the summary
+def timeline_instrumentation(path: str, name: str):
+    from instrumentation import FileSink, HistogramSink, Instrumentation
+
+    stem, extension = os.path.splitext(path)
+    return Instrumentation([FileSink(f"{stem}_{name}{extension or '.csv'}"), HistogramSink()])
+
+
+def print_timeline_summary(instrumentation):
+    summary = instrumentation.sinks[-1].summary()
+    print(f"Mean Memory Utilization: {summary['mean_utilization'] * 100:.2f}% (peak {summary['peak_utilization'] * 100:.2f}%)")
+    print(f"Mean Queue Length: {summary['mean_queue_length']:.2f} (peak {summary['peak_queue_length']})")
+    print(f"Mean Internal Fragmentation: {summary['mean_internal_fragmentation']:.2f}MB")
+
+
+def print_swap_summary(data):
+    share = data['swap_time'] / data['running_time'] * 100 if data['running_time'] else 0.0
+    print(f"Swapped Processes: {data['swapped_processes']}")
+    print(f"Swap Traffic: {data['swap_traffic']:.0f}MB in {data['swap_transfers']} transfers "
+          f"({data['swap_bandwidth_used']:.2f}MB/s)")
+    print(f"Time Spent Swapping: {data['swap_time']:.2f} seconds ({share:.2f}% of the running time)")
+
+
+def print_profile_summary(profile):
+    print("Phase Times: " + ", ".join(f"{phase} {profile[f'{phase}_time'] * 1000:.3f}ms"
+                                      for phase in ("generation", "placement", "queue", "execution")))
+    scans = f" ({profile['scans_per_placement']:.2f} scans per placement)" if "scans" in profile else ""
+    print(f"Placements: {profile['placements']}{scans}")
+    print(f"Queue Pushes/Pops: {profile['queue_pushes']}/{profile['queue_pops']} (max depth {profile['max_queue_depth']})")
+    for name, share in profile.get("samples", {}).items():
+        print(f"Sampled {name}: {share * 100:.1f}%")
+
+
+# The running process of a partition as logged in "partition_state" events
+def process_state(partition: Partition) -> Optional[Tuple[int, int, float]]:
+    if partition.process:
+        return partition.process.process_id, partition.process.size, partition.process.time_needed
+    return None
+
+
+def main(seed: Optional[int] = None, real_time=False, dispatch="fifo", placement="best",
+         memory_size: Optional[int] = None, partition_count: Optional[int] = None,
+         export: Optional[str] = None, plot: bool = True, plot_file: Optional[str] = None,
+         timeline: Optional[str] = None, time_scale: float = 1.0, log_path: Optional[str] = None,
+         log_level: str = "info", swap_bandwidth: Optional[float] = None, swap_latency: float = 0.0,
+         profile: bool = False, cprofile: bool = False, sample_interval: Optional[float] = None):
+    if seed is not None:
+        random.seed(seed)
+
+    if memory_size is None:
+        memory_size = int(input("Please Enter the Memory Size (MB): "))
+    if partition_count is None:
+        partition_count = int(input("Please Enter the partition count: "))
+    process_count = random.randint(10, 20)  # Random process count between 10 and 20
+
+    # Phase timers and counters of each simulation; the workload is generated
+    # once, for both
+    multi_queue_profiler = single_queue_profiler = None
+    if profile or cprofile or sample_interval:
+        from profiling import Profiler
+
+        multi_queue_profiler = Profiler(cprofile, sample_interval)
+        single_queue_profiler = Profiler(cprofile, sample_interval)
+
+    with multi_queue_profiler.phase("generation") if multi_queue_profiler else contextlib.nullcontext():
+        processes = generate_random_processes(process_count)
+        partitions, total_partition_size = generate_random_partitions(partition_count, memory_size)
+    if single_queue_profiler is not None:
+        single_queue_profiler.times["generation"] = multi_queue_profiler.times["generation"]
+
+    # Listings and executed processes go to the event log, which prints them
+    # unless it is written to a file
+    log = EventLog(log_path, LEVELS[log_level]) if log_path else ConsoleLog(LEVELS[log_level])
+    log.log("processes", process_count)
+    for process in processes:
+        log.log("process", process.process_id, process.size, process.time_needed)
+
+    log.log("partitions", partition_count)
+    for partition in partitions:
+        log.log("partition", partition.partition_id, partition.size)
+
+    if total_partition_size > memory_size:
+        print("Error! Total size of partitions is bigger than Memory size!")
+        log.close()
+        return
+
+    # Multi-queue simulation
+    print("\nSimulation with Multiple Queues:")
+    multi_queue = Simulation([partition.copy() for partition in partitions], MultiQueue(), PLACEMENT_POLICIES[placement],
+                             event_log=log, swap=SwapTier(swap_bandwidth, swap_latency) if swap_bandwidth else None,
+                             profiler=multi_queue_profiler)
+    multi_queue_processes = [process.copy() for process in processes]
+    if timeline is not None:
+        multi_queue.instrumentation = timeline_instrumentation(timeline, "multi")
+    multi_queue.allocate(multi_queue_processes)
+    total_used = sum(partition.currently_occupied for partition in multi_queue.partitions)
+    total_execution_time, total_running_time, total_waiting_time = multi_queue.simulate_execution(real_time=real_time, time_scale=time_scale)
+
+    time_utilization = calculate_time_utilization(total_execution_time, total_running_time, multi_queue.concurrency())
+
+    multi_queue_data = {
+        'execution_time': total_execution_time,
+        'running_time': total_running_time,
+        'waiting_time': total_waiting_time,
+        'utilization': time_utilization
+    }
+
+    print("\nProcesses are placed on memory")
+    print("---------- Memory Information (Multi-Queue) ----------")
+    print(f"Memory Size: {memory_size}MB")
+    print(f"Used Size: {total_used}MB")
+    print(f"Remaining Size: {memory_size - total_used}MB")
+    print(f"Utilization: {(total_used / memory_size) * 100:.2f}%")
+    print(f"Total Time Needed for Processes: {total_execution_time:.2f} seconds")
+    print(f"Total Running Time of Application: {total_running_time:.2f} seconds")
+    print(f"Total Waiting Time: {total_waiting_time:.2f} seconds")
+    print(f"Time Utilization: {time_utilization:.2f}%")
+    if multi_queue.instrumentation is not None:
+        print_timeline_summary(multi_queue.instrumentation)
+    if multi_queue.swap is not None:
+        multi_queue_data.update(multi_queue.swap.report(total_running_time))
+        print_swap_summary(multi_queue_data)
+    multi_queue_profile = None
+    if multi_queue.profiler is not None:
+        multi_queue_profile = multi_queue.profiler.metrics()
+        print_profile_summary(multi_queue_profile)
+        multi_queue.profiler.print_stats()
+
+    for i, partition in enumerate(multi_queue.partitions):
+        log.log("partition_state", i + 1, partition.size, process_state(partition),
+                [(proc.process_id, proc.time_needed) for proc in partition.get_queue()])
+
+    # Single queue simulation
+    print("\nSimulation with Single Queue:")
+    queue = SingleQueue() if dispatch == "fifo" else FittingSingleQueue(dispatch)
+    single_queue = Simulation([partition.copy() for partition in partitions], queue, PLACEMENT_POLICIES[placement],
+                              event_log=log, swap=SwapTier(swap_bandwidth, swap_latency) if swap_bandwidth else None,
+                              profiler=single_queue_profiler)
+    single_queue_processes = [process.copy() for process in processes]
+    if timeline is not None:
+        single_queue.instrumentation = timeline_instrumentation(timeline, "single")
+    single_queue.allocate(single_queue_processes)
+    total_used = sum(partition.currently_occupied for partition in single_queue.partitions)
+    total_execution_time, total_running_time, total_waiting_time = single_queue.simulate_execution(real_time=real_time, time_scale=time_scale)
+
+    time_utilization = calculate_time_utilization(total_execution_time, total_running_time, single_queue.concurrency())
+
+    single_queue_data = {
+        'execution_time': total_execution_time,
+        'running_time': total_running_time,
+        'waiting_time': total_waiting_time,
+        'utilization': time_utilization
+    }
+
+    print("\nProcesses are placed on memory")
+    print("---------- Memory Information (Single Queue) ----------")
+    print(f"Memory Size: {memory_size}MB")
+    print(f"Used Size: {total_used}MB")
+    print(f"Remaining Size: {memory_size - total_used}MB")
+    print(f"Utilization: {(total_used / memory_size) * 100:.2f}%")
+    print(f"Total Time Needed for Processes: {total_execution_time:.2f} seconds")
+    print(f"Total Running Time of Application: {total_running_time:.2f} seconds")
+    print(f"Total Waiting Time: {total_waiting_time:.2f} seconds")
+    print(f"Time Utilization: {time_utilization:.2f}%")
+    if single_queue.instrumentation is not None:
+        print_timeline_summary(single_queue.instrumentation)
+    if single_queue.swap is not None:
+        single_queue_data.update(single_queue.swap.report(total_running_time))
+        print_swap_summary(single_queue_data)
+    single_queue_profile = None
+    if single_queue.profiler is not None:
+        single_queue_profile = single_queue.profiler.metrics()
+        print_profile_summary(single_queue_profile)
+        single_queue.profiler.print_stats()
+
+    for i, partition in enumerate(single_queue.partitions):
+        log.log("partition_state", i + 1, partition.size, process_state(partition), None)
+
+    log.log("shared_queue", [proc.process_id for proc in single_queue.waiting_processes()])
+    log.close()
+
+    if export is not None:
+        from export import process_records, write_run
+
+        records = process_records("multi", multi_queue_processes) + process_records("single", single_queue_processes)
+        profiles = {"multi": multi_queue_profile, "single": single_queue_profile} if multi_queue_profile else None
+        written = write_run(export, {"multi": multi_queue_data, "single": single_queue_data}, records, profiles)
+        print(f"\nWrote {', '.join(written)}")
+
+    # Plot comparison
+    if plot_file is not None:
+        plot_comparison(single_queue_data, multi_queue_data, plot_file)
+    elif plot:
+        plot_comparison(single_queue_data, multi_queue_data)
+
+
+if __name__ == "__main__":
+    # Imported here so that importing the module stays cheap
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Memory partitioning simulation")
+    parser.add_argument("--seed", type=int, default=None, help="seed for the random workload")
+    parser.add_argument("--real-time", action="store_true", help="replay the execution in wall-clock time")
+    parser.add_argument("--time-scale", type=float, default=1.0,
+                        help="wall-clock seconds per process second in the real-time replay")
+    parser.add_argument("--dispatch", choices=["fifo", "largest", "oldest"], default="fifo",
+                        help="which waiting process a freed partition takes from the single queue")
+    parser.add_argument("--placement", choices=list(PLACEMENT_POLICIES), default="best",
+                        help="placement policy used to choose a partition for each process")
+    parser.add_argument("--memory-size", type=int, default=None, help="memory size (MB); asked for when omitted")
+    parser.add_argument("--partition-count", type=int, default=None, help="number of partitions; asked for when omitted")
+    parser.add_argument("--export", default=None,
+                        help="write the metrics and per-process records to a .json, .csv or .parquet file")
+    parser.add_argument("--timeline", default=None,
+                        help="record occupancy, queue length and fragmentation timelines to <name>_multi.csv and <name>_single.csv")
+    parser.add_argument("--log", default=None,
+                        help="write the event log to this file instead of printing it; replay it with event_log.py")
+    parser.add_argument("--log-level", choices=list(LEVELS), default="info",
+                        help="detail of the event log: off, info (listings and executed processes) or debug (also completions)")
+    parser.add_argument("--swap-bandwidth", type=float, default=None,
+                        help="back the partitions with a swap tier of this bandwidth (MB/s), so oversized processes run")
+    parser.add_argument("--swap-latency", type=float, default=0.0, help="latency of each swap transfer (seconds)")
+    parser.add_argument("--profile", action="store_true",
+                        help="time the generation, placement, queue and execution phases and count their operations")
+    parser.add_argument("--cprofile", action="store_true", help="also run cProfile over each simulation and print its report")
+    parser.add_argument("--sample-interval", type=float, default=None,
+                        help="also sample the running function every this many seconds")
+    parser.add_argument("--no-plot", action="store_true", help="do not show the comparison plot")
+    parser.add_argument("--plot-file", default=None, help="render the comparison plot to this image file instead of a window")
+    args = parser.parse_args()
+    main(seed=args.seed, real_time=args.real_time, dispatch=args.dispatch, placement=args.placement,
+         memory_size=args.memory_size, partition_count=args.partition_count, export=args.export,
+         plot=not args.no_plot, plot_file=args.plot_file, timeline=args.timeline,
+         time_scale=args.time_scale, log_path=args.log, log_level=args.log_level,
+         swap_bandwidth=args.swap_bandwidth, swap_latency=args.swap_latency, profile=args.profile,
+         cprofile=args.cprofile, sample_interval=args.sample_interval)
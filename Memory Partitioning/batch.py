@@ -0,0 +1,81 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+# Vectorized multi-queue best fit. A workload is held as parallel NumPy arrays
+# (sizes, time_needed, ids) instead of one Process object per job, and a whole
+# arrival batch is placed with a single np.searchsorted against the sorted
+# partition sizes.
+
+
+def generate_random_process_arrays(process_count: int, rng: Optional[np.random.Generator] = None):
+    if rng is None:
+        rng = np.random.default_rng()
+    sizes = rng.integers(10, 101, size=process_count)  # Random size between 10MB and 100MB
+    times_needed = rng.uniform(1, 10, size=process_count)  # Random time needed between 1 and 10 seconds
+    process_ids = np.arange(1, process_count + 1)
+    return sizes, times_needed, process_ids
+
+
+def processes_to_arrays(processes: List["Process"]):
+    sizes = np.fromiter((process.size for process in processes), dtype=np.int64, count=len(processes))
+    times_needed = np.fromiter((process.time_needed for process in processes), dtype=np.float64, count=len(processes))
+    process_ids = np.fromiter((process.process_id for process in processes), dtype=np.int64, count=len(processes))
+    return sizes, times_needed, process_ids
+
+
+def partitions_to_arrays(partitions: List["Partition"]):
+    sizes = np.fromiter((partition.size for partition in partitions), dtype=np.int64, count=len(partitions))
+    partition_ids = np.fromiter((partition.partition_id for partition in partitions), dtype=np.int64, count=len(partitions))
+    return sizes, partition_ids
+
+
+def batch_best_fit(process_sizes: np.ndarray, partition_sizes: np.ndarray, partition_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Returns, per process, the id of the partition it is assigned to (-1 if no
+    # partition is large enough) and its queue position in that partition:
+    # 0 means it is placed immediately, k means it is k-th in the waiting queue.
+    order = np.argsort(partition_sizes, kind="stable")
+    sorted_sizes = partition_sizes[order]
+    sorted_ids = partition_ids[order]
+
+    slots = np.searchsorted(sorted_sizes, process_sizes, side="left")
+    placed = slots < len(sorted_sizes)
+
+    assignments = np.full(len(process_sizes), -1, dtype=np.int64)
+    assignments[placed] = sorted_ids[slots[placed]]
+
+    queue_positions = np.full(len(process_sizes), -1, dtype=np.int64)
+    placed_indices = np.flatnonzero(placed)
+    # Stable grouping by slot keeps arrival order inside each partition's queue
+    grouped = placed_indices[np.argsort(slots[placed_indices], kind="stable")]
+    grouped_slots = slots[grouped]
+    group_starts = np.searchsorted(grouped_slots, grouped_slots, side="left")
+    queue_positions[grouped] = np.arange(len(grouped)) - group_starts
+
+    return assignments, queue_positions
+
+
+def batch_simulate(process_sizes: np.ndarray, times_needed: np.ndarray, partition_sizes: np.ndarray, partition_ids: np.ndarray):
+    # Multi-queue partitions run their FIFO queues independently, so each start
+    # time is the running sum of the jobs queued ahead of it in the partition.
+    assignments, queue_positions = batch_best_fit(process_sizes, partition_sizes, partition_ids)
+
+    placed_indices = np.flatnonzero(assignments >= 0)
+    grouped = placed_indices[np.lexsort((queue_positions[placed_indices], assignments[placed_indices]))]
+    durations = times_needed[grouped]
+    totals = np.cumsum(durations)
+    heads = queue_positions[grouped] == 0
+    # Subtract everything grouped before each partition's first job
+    before_group = (totals - durations)[heads]
+    group_lengths = np.diff(np.append(np.flatnonzero(heads), len(grouped)))
+    finish_times = totals - np.repeat(before_group, group_lengths)
+
+    start_times = np.full(len(process_sizes), np.nan)
+    start_times[grouped] = finish_times - durations
+
+    total_execution_time = float(durations.sum())
+    total_running_time = float(finish_times.max()) if len(grouped) else 0.0
+    total_waiting_time = float(start_times[grouped].sum())
+
+    return assignments, queue_positions, start_times, (total_execution_time, total_running_time, total_waiting_time)
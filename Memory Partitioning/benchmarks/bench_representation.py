@@ -0,0 +1,84 @@
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from typing import List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from MainProgram import Partition, Process
+
+
+# The original dict-based classes, kept here as the "before" side of the
+# comparison. LegacyProcess also has the fields Process gained later, so the
+# two differ only in representation.
+class LegacyProcess:
+    def __init__(self, size: int, process_id: int, time_needed: float, arrival_time: float = 0.0):
+        self.process_id = process_id
+        self.size = size
+        self.size_on_memory = 0
+        self.partition: Optional["LegacyPartition"] = None
+        self.time_needed = time_needed
+        self.waiting_time = 0.0
+        self.arrival_time = arrival_time
+        self.enqueue_time = arrival_time
+        self.start_time: Optional[float] = None
+        self.finish_time: Optional[float] = None
+        self.resident_size = size
+        self.swapped_size = 0
+
+
+class LegacyPartition:
+    def __init__(self, size: int, partition_id: int):
+        self.partition_id = partition_id
+        self.size = size
+        self.currently_occupied = 0
+        self.process: Optional[LegacyProcess] = None
+        self.waiting_processes: List[LegacyProcess] = []
+
+
+def bytes_per_process(process_type, count: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    processes = [process_type(50, i + 1, 5.0) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Exclude the list that holds the processes
+    return (after - before - sys.getsizeof(processes)) / count
+
+
+def dequeue_seconds(partition_type, process_type, count: int, legacy: bool) -> float:
+    partition = partition_type(100, 1)
+    for i in range(count):
+        partition.waiting_processes.append(process_type(50, i + 1, 5.0))
+
+    start = time.perf_counter()
+    queue = partition.waiting_processes
+    if legacy:
+        while queue:
+            queue.pop(0)
+    else:
+        while queue:
+            queue.popleft()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the legacy and compact Process/Partition representations")
+    parser.add_argument("--processes", type=int, default=100000, help="number of processes to allocate")
+    parser.add_argument("--queue-length", type=int, default=100000, help="length of the drained waiting queue")
+    args = parser.parse_args()
+
+    legacy_bytes = bytes_per_process(LegacyProcess, args.processes)
+    compact_bytes = bytes_per_process(Process, args.processes)
+    legacy_dequeue = dequeue_seconds(LegacyPartition, LegacyProcess, args.queue_length, legacy=True)
+    compact_dequeue = dequeue_seconds(Partition, Process, args.queue_length, legacy=False)
+
+    print(f"{'':<24}{'before':>14}{'after':>14}")
+    print(f"{'Bytes per process':<24}{legacy_bytes:>14.1f}{compact_bytes:>14.1f}")
+    print(f"{'Dequeue cost (ns/op)':<24}{legacy_dequeue / args.queue_length * 1e9:>14.1f}{compact_dequeue / args.queue_length * 1e9:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
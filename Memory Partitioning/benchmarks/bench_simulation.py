@@ -0,0 +1,219 @@
+import argparse
+import datetime
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from MainProgram import MultiQueue, Partition, Simulation, SingleQueue, generate_random_partitions, generate_random_processes
+from partition_index import PartitionIndex
+
+# Benchmarks for the allocation and simulation hot paths. Every run is appended
+# to a JSON lines history file with the commit it was measured on, and each
+# result is compared with the latest one from an earlier commit so that
+# regressions show up between commits.
+
+HISTORY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "history.jsonl")
+
+QUEUES = {
+    "multi": MultiQueue,
+    "single": SingleQueue,
+}
+
+
+def make_workload(process_count: int, partition_count: int, seed: int):
+    rng = random.Random(seed)
+    # Enough memory for partitions of 10 to about 200 MB, so most processes fit
+    partitions, _ = generate_random_partitions(partition_count, partition_count * 200, rng)
+    return generate_random_processes(process_count, rng), partitions
+
+
+# Each benchmark prepares its workload untimed and returns a callable that runs
+# the hot path once and returns the number of events it handled.
+def bench_allocate(process_count: int, partition_count: int, queue_mode: str, seed: int) -> Callable[[], int]:
+    processes, partitions = make_workload(process_count, partition_count, seed)
+    simulation = Simulation(partitions, QUEUES[queue_mode]())
+    simulation.setup()
+
+    def run():
+        for process in processes:
+            simulation.place(process)
+        return len(processes)
+    return run
+
+
+def bench_partition_cycle(process_count: int, partition_count: int, queue_mode: str, seed: int) -> Callable[[], int]:
+    # Pushes every process through one partition: add_new_process queues all but
+    # the first, and remove_current_process starts the next until none are left
+    processes, _ = make_workload(process_count, 1, seed)
+    partition = Partition(100, 1)
+    PartitionIndex([partition])
+    queue = SingleQueue() if queue_mode == "single" else None
+
+    def run():
+        for process in processes:
+            partition.add_new_process(process, queue)
+        while partition.process:
+            partition.remove_current_process(queue)
+        return 2 * len(processes)
+    return run
+
+
+def bench_simulate(process_count: int, partition_count: int, queue_mode: str, seed: int) -> Callable[[], int]:
+    processes, partitions = make_workload(process_count, partition_count, seed)
+    simulation = Simulation(partitions, QUEUES[queue_mode]())
+    simulation.allocate(processes)
+
+    def run():
+        simulation.simulate_execution(verbose=False)
+        # One start and one completion event per completed process
+        return 2 * simulation.completed
+    return run
+
+
+BENCHMARKS = {
+    "allocate": bench_allocate,
+    "partition_cycle": bench_partition_cycle,
+    "simulate": bench_simulate,
+}
+
+
+def measure(benchmark, process_count: int, partition_count: int, queue_mode: str, seed: int,
+            repeat: int, trace_memory: bool) -> Dict:
+    # Best wall time over repeat fresh runs, then one traced run for the peak
+    # memory, since tracemalloc slows down the code it traces
+    wall_seconds = float("inf")
+    events = 0
+    for _ in range(repeat):
+        run = benchmark(process_count, partition_count, queue_mode, seed)
+        start = time.perf_counter()
+        events = run()
+        wall_seconds = min(wall_seconds, time.perf_counter() - start)
+
+    peak_bytes = None
+    if trace_memory:
+        tracemalloc.start()
+        run = benchmark(process_count, partition_count, queue_mode, seed)
+        tracemalloc.reset_peak()
+        run()
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        "wall_seconds": wall_seconds,
+        "peak_bytes": peak_bytes,
+        "events": events,
+        "events_per_second": events / wall_seconds if wall_seconds else None,
+    }
+
+
+def current_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def result_key(record: Dict) -> Tuple:
+    return record["benchmark"], record["queue_mode"], record["processes"], record["partitions"]
+
+
+def read_history(path: str) -> List[Dict]:
+    if not os.path.exists(path):
+        return []
+    with open(path) as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def append_history(path: str, records: List[Dict]):
+    with open(path, "a") as file:
+        for record in records:
+            file.write(json.dumps(record) + "\n")
+
+
+def find_baselines(history: List[Dict], commit: Optional[str]) -> Dict[Tuple, Dict]:
+    # The latest result for each benchmark measured on a different commit
+    baselines = {}
+    for record in history:
+        if commit is None or record.get("commit") != commit:
+            baselines[result_key(record)] = record
+    return baselines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark allocation, partition queueing and simulation at scale")
+    parser.add_argument("--benchmarks", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS),
+                        help="benchmarks to run")
+    parser.add_argument("--process-counts", type=int, nargs="+", default=[100, 1000, 10000, 100000],
+                        help="process counts (up to 10^7)")
+    parser.add_argument("--partition-counts", type=int, nargs="+", default=[10, 100, 1000],
+                        help="partition counts (up to 10^5)")
+    parser.add_argument("--queue-modes", nargs="+", choices=list(QUEUES), default=list(QUEUES), help="queue strategies")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the workloads")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark; the fastest is kept")
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced run that measures peak memory")
+    parser.add_argument("--history", default=HISTORY_PATH, help="JSON lines file the results are appended to")
+    parser.add_argument("--no-history", action="store_true", help="do not record the results")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="slowdown relative to the previous commit that counts as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit with status 1 if any benchmark regressed")
+    args = parser.parse_args()
+
+    commit = current_commit()
+    baselines = find_baselines(read_history(args.history), commit)
+    timestamp = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+
+    records = []
+    regressions = 0
+    print(f"{'Benchmark':<18}{'Queue':<8}{'Processes':>11}{'Partitions':>12}{'Wall (s)':>12}{'Peak (MB)':>11}"
+          f"{'Events/s':>14}{'Change':>9}")
+    for name, queue_mode, process_count, partition_count in itertools.product(
+            args.benchmarks, args.queue_modes, args.process_counts, args.partition_counts):
+        # The partition cycle runs on one partition, so the partition count does not apply
+        if name == "partition_cycle" and partition_count != args.partition_counts[0]:
+            continue
+        result = measure(BENCHMARKS[name], process_count, partition_count, queue_mode, args.seed,
+                         args.repeat, not args.no_memory)
+        record = {
+            "benchmark": name,
+            "queue_mode": queue_mode,
+            "processes": process_count,
+            "partitions": 1 if name == "partition_cycle" else partition_count,
+            **result,
+            "commit": commit,
+            "timestamp": timestamp,
+            "python": platform.python_version(),
+        }
+        records.append(record)
+
+        change = ""
+        baseline = baselines.get(result_key(record))
+        if baseline:
+            ratio = record["wall_seconds"] / baseline["wall_seconds"] - 1
+            change = f"{ratio:+.0%}"
+            if ratio > args.threshold:
+                change += " !"
+                regressions += 1
+        peak = f"{record['peak_bytes'] / 2**20:.1f}" if record["peak_bytes"] is not None else "-"
+        print(f"{name:<18}{queue_mode:<8}{process_count:>11}{record['partitions']:>12}{record['wall_seconds']:>12.4f}"
+              f"{peak:>11}{record['events_per_second']:>14.0f}{change:>9}")
+
+    if not args.no_history:
+        append_history(args.history, records)
+    if regressions:
+        print(f"{regressions} benchmark(s) more than {args.threshold:.0%} slower than the previous commit (marked !)")
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
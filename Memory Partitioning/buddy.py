@@ -0,0 +1,80 @@
+import heapq
+from typing import List, Optional, Set
+
+from dynamic_memory import DynamicPlacement
+
+
+# Buddy-system allocator for variable partitions. Memory is split into
+# power-of-two blocks on demand, and a released block is merged with its buddy
+# whenever both halves are free. Each order keeps a heap of free block addresses
+# (lowest address first) with a set for lazy deletion, so allocation and release
+# cost O(log M) for a memory of M MB.
+class BuddyAllocator(DynamicPlacement):
+    def __init__(self, partitions: List["Partition"], memory_size: int, partition_type):
+        super().__init__(partitions, memory_size, partition_type)
+        self.max_order = max(memory_size.bit_length() - 1, 0)
+        self.free_heaps: List[List[int]] = [[] for _ in range(self.max_order + 1)]
+        self.free_blocks: List[Set[int]] = [set() for _ in range(self.max_order + 1)]
+
+        # Memory that is not a power of two is covered by one top-level block
+        # per set bit, largest first, so every block stays aligned to its size
+        # and blocks never merge across top-level boundaries.
+        address = 0
+        for order in range(self.max_order, -1, -1):
+            if memory_size & (1 << order):
+                self._push(order, address)
+                address += 1 << order
+
+    def _push(self, order: int, address: int):
+        heapq.heappush(self.free_heaps[order], address)
+        self.free_blocks[order].add(address)
+        self.free_memory += 1 << order
+
+    def _pop(self, order: int) -> int:
+        heap = self.free_heaps[order]
+        while True:
+            address = heapq.heappop(heap)
+            if address in self.free_blocks[order]:
+                self.free_blocks[order].remove(address)
+                self.free_memory -= 1 << order
+                return address
+
+    def largest_free(self) -> int:
+        for order in range(self.max_order, -1, -1):
+            if self.free_blocks[order]:
+                return 1 << order
+        return 0
+
+    def find_free(self, size: int) -> Optional["Partition"]:
+        order = max(size - 1, 0).bit_length()
+        available = order
+        while available <= self.max_order and not self.free_blocks[available]:
+            available += 1
+        if self.scan_counter is not None:
+            # The free lists of every order looked at
+            self.scan_counter.scanned(max(min(available, self.max_order) - order + 1, 0))
+        if available > self.max_order:
+            return None
+
+        address = self._pop(available)
+        # Split down to the needed order, freeing the upper halves
+        while available > order:
+            available -= 1
+            self._push(available, address + (1 << available))
+
+        return self._register(1 << order, address)
+
+    def mark_free(self, partition: "Partition"):
+        self._unregister(partition)
+
+        address = partition.partition_id
+        order = partition.size.bit_length() - 1
+        while order < self.max_order:
+            buddy = address ^ (1 << order)
+            if buddy not in self.free_blocks[order]:
+                break
+            self.free_blocks[order].remove(buddy)
+            self.free_memory -= 1 << order
+            address = min(address, buddy)
+            order += 1
+        self._push(order, address)
@@ -0,0 +1,268 @@
+import copyreg
+import io
+import itertools
+import os
+import pickle
+import signal
+import tempfile
+import threading
+import time
+import zlib
+from array import array
+from typing import Dict, Iterable, Optional, Tuple
+
+# Checkpoints of the discrete-event engine, so a long run (a trace replay
+# above all) survives a crash or an interrupt. A Checkpointer passed to
+# Simulation.simulate_execution(checkpoint=...) is asked after every event
+# whether a snapshot is due; resume() loads the latest snapshot and continues
+# the run from there, giving the same results as an uninterrupted run.
+#
+# A checkpoint at path is three files:
+#
+#   path                  the simulator state (partitions, queues, policy,
+#                         pending events, clock and totals), pickled and
+#                         zlib-compressed, replaced atomically
+#   path.waits            the waiting times, as raw doubles
+#   path.fragmentation    the fragmentation timeline, as (time, value) doubles
+#
+# The last two only grow during a run, so each snapshot appends what was added
+# since the previous one instead of rewriting them. The snapshot records their
+# lengths, and resume() cuts off anything written after it.
+#
+# Where os.fork is available, a snapshot is written by a forked child from its
+# copy-on-write view of the state, and the simulation only pays for the fork.
+# Elsewhere the state is pickled in the simulation's thread and written by a
+# background thread. Snapshots are taken at most every interval seconds, and
+# never more often than keeps their CPU time under max_overhead of the wall
+# time; one that falls due while the previous one is still being written is
+# skipped.
+#
+# Instrumentation and the event log hold open files, and a profiler measures
+# one process, so they are not part of a snapshot; pass new ones to resume().
+# Arrivals are not stored either: pass the same stream to resume(), which
+# skips the arrivals already read.
+
+# Events between two looks at the wall clock
+CHECK_EVERY = 1024
+
+
+def _set_attributes(obj, state: Dict):
+    for name, value in state.items():
+        setattr(obj, name, value)
+
+
+class _StatePickler(pickle.Pickler):
+    def __init__(self, file, simulation):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        # Kept out of the snapshot, by identity
+        self.external = {
+            id(simulation.waiting_times): "waiting_times",
+            id(simulation.fragmentation): "fragmentation",
+        }
+        if simulation.instrumentation is not None:
+            self.external[id(simulation.instrumentation)] = "instrumentation"
+        if simulation.event_log is not None:
+            self.external[id(simulation.event_log)] = "event_log"
+        if simulation.profiler is not None:
+            self.external[id(simulation.profiler)] = "profiler"
+
+    def persistent_id(self, obj):
+        return self.external.get(id(obj))
+
+    def reducer_override(self, obj):
+        # Plain objects are restored attribute by attribute. The default
+        # restores their __dict__ as a whole, and on CPython 3.11 an object
+        # whose __dict__ was materialized has slower attribute access, which
+        # the resumed run would pay on every event.
+        cls = type(obj)
+        if (cls.__module__ == "builtins" or isinstance(obj, type) or not hasattr(obj, "__dict__")
+                or cls.__reduce_ex__ is not object.__reduce_ex__ or cls.__reduce__ is not object.__reduce__):
+            return NotImplemented
+        return copyreg.__newobj__, (cls,), obj.__dict__, None, None, _set_attributes
+
+
+class _StateUnpickler(pickle.Unpickler):
+    def __init__(self, file, external: Dict):
+        super().__init__(file)
+        self.external = external
+
+    def persistent_load(self, name):
+        return self.external[name]
+
+
+class Checkpointer:
+    def __init__(self, path: str, interval: float = 60.0, max_overhead: float = 0.05):
+        self.path = path
+        self.interval = interval
+        self.max_overhead = max_overhead
+        self.countdown = CHECK_EVERY
+        self.last_snapshot = time.monotonic()
+        # CPU seconds the last written snapshot took, in the simulation and
+        # the writer, and the simulation's share of the one being written
+        self.cost = 0.0
+        self.stall = 0.0
+        self.snapshots = 0
+        self.skipped = 0
+        # Lengths of the waiting times and fragmentation already on disk
+        self.waits_written = 0
+        self.fragmentation_written = 0
+        self.child: Optional[int] = None
+        self.writer: Optional[threading.Thread] = None
+        self.error: Optional[BaseException] = None
+
+    def start(self, simulation):
+        # Called when a fresh run begins: the journals start out empty
+        self.wait()
+        for suffix in (".waits", ".fragmentation"):
+            open(self.path + suffix, "wb").close()
+        self.waits_written = self.fragmentation_written = 0
+        self.last_snapshot = time.monotonic()
+
+    def due(self) -> bool:
+        self.countdown -= 1
+        if self.countdown > 0:
+            return False
+        self.countdown = CHECK_EVERY
+        elapsed = time.monotonic() - self.last_snapshot
+        return elapsed >= self.interval and elapsed * self.max_overhead >= self.cost
+
+    def busy(self) -> bool:
+        # Whether the previous snapshot is still being written
+        if self.child is not None:
+            pid, status, usage = os.wait4(self.child, os.WNOHANG)
+            if pid == 0:
+                return True
+            self._reaped(status, usage)
+        return self.writer is not None and self.writer.is_alive()
+
+    def _reaped(self, status: int, usage):
+        self.child = None
+        self.cost = self.stall + usage.ru_utime + usage.ru_stime
+        if os.waitstatus_to_exitcode(status) != 0:
+            self.error = RuntimeError(f"Writing the checkpoint {self.path} failed")
+
+    def save(self, simulation, state: Dict):
+        # state holds the engine's local variables, from simulate_execution
+        if self.busy():
+            self.skipped += 1
+            return
+        self.wait()
+        started = time.process_time()
+        waits = (self.waits_written, len(simulation.waiting_times))
+        fragmentation = (self.fragmentation_written, len(simulation.fragmentation))
+        if hasattr(os, "fork"):
+            pid = os.fork()
+            if pid == 0:
+                # An interrupt meant for the simulation lets the snapshot
+                # finish. The child exits without running cleanup handlers or
+                # flushing files shared with the simulation.
+                signal.signal(signal.SIGINT, signal.SIG_IGN)
+                code = 1
+                try:
+                    self._write(*self._serialize(simulation, state, waits, fragmentation))
+                    code = 0
+                finally:
+                    os._exit(code)
+            self.child = pid
+        else:
+            data = self._serialize(simulation, state, waits, fragmentation)
+            self.writer = threading.Thread(target=self._write_in_thread, args=data, daemon=True)
+            self.writer.start()
+        self.waits_written = waits[1]
+        self.fragmentation_written = fragmentation[1]
+        self.snapshots += 1
+        self.last_snapshot = time.monotonic()
+        self.stall = time.process_time() - started
+        if self.child is None:
+            # The writer thread's time is not measured apart from the
+            # simulation's, so the pickling stands in for the whole snapshot
+            self.cost = self.stall
+
+    def _serialize(self, simulation, state: Dict, waits: Tuple[int, int], fragmentation: Tuple[int, int]):
+        buffer = io.BytesIO()
+        # The journal lengths come first, as they are needed to load the rest
+        pickle.dump((waits[1], fragmentation[1]), buffer)
+        _StatePickler(buffer, simulation).dump((simulation, state))
+        new_waits = simulation.waiting_times[waits[0]:waits[1]].tobytes()
+        new_fragmentation = array("d", itertools.chain.from_iterable(
+            simulation.fragmentation[fragmentation[0]:fragmentation[1]])).tobytes()
+        return buffer.getvalue(), new_waits, new_fragmentation
+
+    def _write(self, data: bytes, waits: bytes, fragmentation: bytes):
+        # Journals first, so the snapshot never refers to data not on disk
+        for suffix, tail in ((".waits", waits), (".fragmentation", fragmentation)):
+            with open(self.path + suffix, "ab") as file:
+                file.write(tail)
+                file.flush()
+                os.fsync(file.fileno())
+        directory = os.path.dirname(os.path.abspath(self.path))
+        descriptor, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(zlib.compress(data, 1))
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temporary, self.path)
+        except BaseException:
+            os.remove(temporary)
+            raise
+
+    def _write_in_thread(self, *data):
+        try:
+            self._write(*data)
+        except BaseException as error:
+            self.error = error
+
+    def wait(self):
+        # Waits for the snapshot being written, and raises if writing it failed
+        if self.child is not None:
+            _, status, usage = os.wait4(self.child, 0)
+            self._reaped(status, usage)
+        if self.writer is not None:
+            self.writer.join()
+            self.writer = None
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def close(self):
+        self.wait()
+
+
+def _read_journal(path: str, count: int) -> array:
+    # The first count doubles of the journal, which is cut back to them
+    values = array("d")
+    with open(path, "r+b") as file:
+        values.frombytes(file.read(count * values.itemsize))
+        if len(values) < count:
+            raise ValueError(f"{path} is shorter than its snapshot expects")
+        file.truncate(count * values.itemsize)
+    return values
+
+
+def load(path: str, instrumentation=None, event_log=None) -> Tuple["Simulation", Dict]:
+    # The simulation and engine state of the snapshot at path
+    with open(path, "rb") as file:
+        buffer = io.BytesIO(zlib.decompress(file.read()))
+    waits_count, fragmentation_count = pickle.load(buffer)
+    waiting_times = _read_journal(path + ".waits", waits_count)
+    flat = _read_journal(path + ".fragmentation", 2 * fragmentation_count)
+    fragmentation = list(zip(flat[::2], flat[1::2]))
+    external = {"waiting_times": waiting_times, "fragmentation": fragmentation,
+                "instrumentation": instrumentation, "event_log": event_log, "profiler": None}
+    return _StateUnpickler(buffer, external).load()
+
+
+def resume(path: str, arrivals: Optional[Iterable["Process"]] = None, verbose: bool = False,
+           checkpoint: Optional[Checkpointer] = None, instrumentation=None, event_log=None):
+    # Continues the run checkpointed at path to its end and returns the
+    # simulation with its totals, as simulate_execution does. Pass a
+    # Checkpointer for the same path to keep checkpointing.
+    simulation, state = load(path, instrumentation, event_log)
+    simulation.instrumentation = instrumentation
+    simulation.event_log = event_log
+    if checkpoint is not None:
+        checkpoint.waits_written = len(simulation.waiting_times)
+        checkpoint.fragmentation_written = len(simulation.fragmentation)
+    totals = simulation.simulate_execution(verbose=verbose, arrivals=arrivals, checkpoint=checkpoint, resume=state)
+    return simulation, totals
@@ -0,0 +1,134 @@
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+from partition_index import MaxSegmentTree
+
+
+# Base for placement policies that carve partitions out of memory on demand
+# instead of choosing among fixed ones. The allocated partitions are kept in
+# the partitions list the simulation passed in, and a partition's partition_id
+# is its start address. Partitions only exist while they run a process, so
+# dynamic policies need a single queue. scan_counter works as for the fixed
+# policies in partition_index.
+class DynamicPlacement:
+    dynamic = True
+    scan_counter = None
+
+    def __init__(self, partitions: List["Partition"], memory_size: int, partition_type):
+        self.partitions = partitions
+        self.memory_size = memory_size
+        self.partition_type = partition_type
+        self.free_memory = 0
+        # Most partitions allocated at once
+        self.peak_partitions = 0
+
+    def find(self, size: int) -> Optional["Partition"]:
+        raise ValueError(f"{type(self).__name__} creates partitions on demand and needs a single queue")
+
+    def mark_busy(self, partition: "Partition"):
+        pass
+
+    def _register(self, size: int, address: int) -> "Partition":
+        partition = self.partition_type(size, address)
+        partition.index = self
+        partition.index_position = len(self.partitions)
+        self.partitions.append(partition)
+        if len(self.partitions) > self.peak_partitions:
+            self.peak_partitions = len(self.partitions)
+        return partition
+
+    def _unregister(self, partition: "Partition"):
+        # Swap-remove the partition from the partitions list
+        last = self.partitions.pop()
+        if last is not partition:
+            self.partitions[partition.index_position] = last
+            last.index_position = partition.index_position
+        partition.index = None
+
+    def external_fragmentation(self) -> float:
+        # Share of free memory outside the largest allocatable block
+        if not self.free_memory:
+            return 0.0
+        return 1 - self.largest_free() / self.free_memory
+
+
+# Variable partitioning: every process gets a partition of exactly its size,
+# split from the best-fitting hole. Holes are linked in address order through
+# two maps keyed on their start and end, so a released partition coalesces
+# with both neighbours in O(1). A segment tree over hole sizes (one leaf per MB)
+# with per-size heaps of start addresses finds the smallest hole that fits,
+# lowest address first, in O(log M).
+class VariablePartitioning(DynamicPlacement):
+    def __init__(self, partitions: List["Partition"], memory_size: int, partition_type):
+        super().__init__(partitions, memory_size, partition_type)
+        self.hole_size: Dict[int, int] = {}
+        self.hole_at_end: Dict[int, int] = {}
+        self.hole_count = [0] * (memory_size + 1)
+        self.hole_starts: Dict[int, List[int]] = {}
+        self.sizes = MaxSegmentTree([-1] * (memory_size + 1))
+        if memory_size > 0:
+            self._add_hole(0, memory_size)
+
+    def _add_hole(self, start: int, size: int):
+        self.hole_size[start] = size
+        self.hole_at_end[start + size] = start
+        heapq.heappush(self.hole_starts.setdefault(size, []), start)
+        self.hole_count[size] += 1
+        if self.hole_count[size] == 1:
+            self.sizes.update(size, size)
+        self.free_memory += size
+
+    def _remove_hole(self, start: int) -> int:
+        size = self.hole_size.pop(start)
+        del self.hole_at_end[start + size]
+        self.hole_count[size] -= 1
+        if self.hole_count[size] == 0:
+            self.sizes.update(size, -1)
+        self.free_memory -= size
+        return size
+
+    def _lowest_hole(self, size: int) -> int:
+        # Heap entries of holes that were merged or split away are dropped lazily
+        starts = self.hole_starts[size]
+        while self.hole_size.get(starts[0]) != size:
+            heapq.heappop(starts)
+        return starts[0]
+
+    def largest_free(self) -> int:
+        return max(self.sizes.maximum(), 0)
+
+    def find_free(self, size: int) -> Optional["Partition"]:
+        size = max(size, 1)
+        if size > self.largest_free():
+            return None
+        hole = self.sizes.first_at_least(size, size)
+        if self.scan_counter is not None:
+            self.scan_counter.scanned(self.sizes.visits(size, hole))
+        start = self._lowest_hole(hole)
+        self._remove_hole(start)
+        if hole > size:
+            self._add_hole(start + size, hole - size)
+        return self._register(size, start)
+
+    def mark_free(self, partition: "Partition"):
+        self._unregister(partition)
+        start = partition.partition_id
+        size = partition.size
+        if start in self.hole_at_end:
+            start = self.hole_at_end[start]
+            size += self._remove_hole(start)
+        if start + size in self.hole_size:
+            size += self._remove_hole(start + size)
+        self._add_hole(start, size)
+
+
+def mean_fragmentation(timeline: List[Tuple[float, float]], end_time: float) -> float:
+    # Time-weighted mean of a (time, fragmentation) step function up to end_time
+    if not timeline:
+        return 0.0
+    if end_time <= timeline[0][0]:
+        return timeline[-1][1]
+    total = 0.0
+    for (time, value), (next_time, _) in zip(timeline, timeline[1:] + [(end_time, 0.0)]):
+        total += value * (next_time - time)
+    return total / (end_time - timeline[0][0])
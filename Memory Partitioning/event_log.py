@@ -0,0 +1,147 @@
+import json
+import sys
+from typing import IO, Iterable, Iterator, List, Optional
+
+# Leveled log of simulation events, in place of printing every event. An
+# event is a kind followed by its fields, e.g. ("start", time, process_id,
+# partition_id, time_needed), and is kept if its level is at or below the
+# log's level. EventLog buffers events and writes them in batches as JSON
+# lines, one array per event; ConsoleLog renders them as text right away.
+# render() turns an event back into the text MainProgram used to print, so
+# running this module on a log file replays the console output:
+#
+#   python event_log.py run.log [--level debug]
+
+OFF = 0
+INFO = 1
+DEBUG = 2
+LEVELS = {"off": OFF, "info": INFO, "debug": DEBUG}
+
+# Reused for every batch; json.dumps builds a new encoder per call when given
+# separators
+_encode = json.JSONEncoder(separators=(",", ":")).encode
+
+EVENT_LEVELS = {
+    "processes": INFO,
+    "process": INFO,
+    "partitions": INFO,
+    "partition": INFO,
+    "start": INFO,
+    "finish": DEBUG,
+    "preempt": DEBUG,
+    "partition_state": INFO,
+    "shared_queue": INFO,
+}
+
+
+def render(event: List) -> str:
+    kind = event[0]
+    if kind == "processes":
+        return f"\nGenerated {event[1]} processes:"
+    if kind == "process":
+        _, process_id, size, time_needed = event
+        return f"Process {process_id}: Size = {size}MB, Time Needed = {time_needed:.2f} seconds"
+    if kind == "partitions":
+        return f"\nGenerated {event[1]} partitions:"
+    if kind == "partition":
+        _, partition_id, size = event
+        return f"Partition {partition_id}: Size = {size}MB"
+    if kind == "start":
+        _, _, process_id, partition_id, time_needed = event
+        return f"Executing Process P{process_id} in Partition {partition_id} for {time_needed} seconds."
+    if kind == "finish":
+        _, time, process_id, partition_id = event
+        return f"Finished Process P{process_id} in Partition {partition_id} at {time:.2f} seconds."
+    if kind == "preempt":
+        _, time, process_id, partition_id = event
+        return f"Preempted Process P{process_id} in Partition {partition_id} at {time:.2f} seconds."
+    if kind == "partition_state":
+        # queue is None in single-queue mode, where partitions have no queue
+        _, number, size, process, queue = event
+        lines = [f"\n---- Partition {number}:", f"Size: {size}MB"]
+        if process is not None:
+            process_id, process_size, time_needed = process
+            lines += [f"Current Process: P{process_id}", f"Process Size: {process_size}MB", f"Time Needed: {time_needed} seconds"]
+        else:
+            lines.append("Current Process: NONE")
+        if queue is not None:
+            lines.append(f"Queue for Partition {number}:")
+            lines += [f"- Process P{process_id} - Time Needed: {time_needed} seconds" for process_id, time_needed in queue] or ["Empty"]
+        return "\n".join(lines)
+    if kind == "shared_queue":
+        return "\nShared Waiting Queue: [" + " - ".join(f"P{process_id}" for process_id in event[1]) + "]"
+    return " ".join(str(field) for field in event)
+
+
+class EventLog:
+    def __init__(self, path: str, level: int = INFO, batch_size: int = 4096):
+        self.level = level
+        self.batch_size = batch_size
+        self.batch: List[List] = []
+        self.file: Optional[IO] = open(path, "w") if level > OFF else None
+
+    def enabled(self, level: int) -> bool:
+        return level <= self.level
+
+    def log(self, kind: str, *fields):
+        if EVENT_LEVELS.get(kind, INFO) <= self.level:
+            self.write([kind, *fields])
+
+    def write(self, event: List):
+        self.batch.append(event)
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.batch and self.file is not None:
+            self.file.write("\n".join(map(_encode, self.batch)) + "\n")
+        self.batch = []
+
+    def close(self):
+        self.flush()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class ConsoleLog(EventLog):
+    def __init__(self, level: int = INFO, stream: Optional[IO] = None):
+        self.level = level
+        self.stream = stream
+
+    def write(self, event: List):
+        print(render(event), file=self.stream or sys.stdout)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def read_log(path: str) -> Iterator[List]:
+    with open(path, buffering=1 << 20) as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def replay(events: Iterable[List], level: int = DEBUG, stream: Optional[IO] = None):
+    stream = stream or sys.stdout
+    for event in events:
+        if EVENT_LEVELS.get(event[0], INFO) <= level:
+            stream.write(render(event) + "\n")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Render an event log as the simulator's console output")
+    parser.add_argument("log", help="event log written with --log")
+    parser.add_argument("--level", choices=["info", "debug"], default="debug", help="most detailed level to show")
+    args = parser.parse_args()
+    replay(read_log(args.log), LEVELS[args.level])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import csv
+import json
+import os
+from typing import Dict, Iterable, List, Optional
+
+# Headless output of a simulation run: the per-queue metrics (the
+# single_queue_data/multi_queue_data dictionaries of MainProgram.main) and one
+# record per process. JSON output holds both in one file. CSV and Parquet are
+# tabular, so the process records go to a second file next to the metrics,
+# named <name>_processes.<ext>. Parquet output requires pyarrow.
+
+METRIC_COLUMNS = ["queue", "execution_time", "running_time", "waiting_time", "utilization"]
+# Present when the run had a swap tier
+SWAP_COLUMNS = ["swapped_processes", "swap_traffic", "swap_transfers", "swap_time", "swap_bandwidth_used"]
+PROCESS_COLUMNS = ["queue", "process_id", "size", "swapped_size", "time_needed", "arrival_time", "enqueue_time",
+                   "start_time", "finish_time", "waiting_time"]
+
+
+def metric_rows(metrics: Dict[str, Dict[str, float]]) -> List[Dict]:
+    return [{"queue": queue, **data} for queue, data in metrics.items()]
+
+
+def process_records(queue: str, processes: Iterable["Process"]) -> List[Dict]:
+    # start_time and finish_time are None for processes that never ran
+    records = []
+    for process in processes:
+        records.append({
+            "queue": queue,
+            "process_id": process.process_id,
+            "size": process.size,
+            "swapped_size": process.swapped_size,
+            "time_needed": process.time_needed,
+            "arrival_time": process.arrival_time,
+            "enqueue_time": process.enqueue_time,
+            "start_time": process.start_time,
+            "finish_time": process.finish_time,
+            "waiting_time": process.waiting_time,
+        })
+    return records
+
+
+def processes_path(path: str) -> str:
+    stem, extension = os.path.splitext(path)
+    return f"{stem}_processes{extension}"
+
+
+def _write_table(rows: List[Dict], columns: List[str], path: str):
+    if path.endswith(".parquet"):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        pq.write_table(pa.Table.from_pylist([{column: row[column] for column in columns} for row in rows]), path)
+        return
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_run(path: str, metrics: Dict[str, Dict[str, float]], records: List[Dict],
+              profiles: Optional[Dict[str, Dict]] = None) -> List[str]:
+    # Writes the metrics and process records and returns the files written.
+    # profiles, the profiler metrics per queue, only go to JSON output.
+    if path.endswith(".json"):
+        run = {"metrics": metrics, "processes": records}
+        if profiles is not None:
+            run["profile"] = profiles
+        with open(path, "w") as file:
+            json.dump(run, file, indent=2)
+        return [path]
+    if not path.endswith((".csv", ".parquet")):
+        raise ValueError(f"Unknown export format for {path}; expected .json, .csv or .parquet")
+    rows = metric_rows(metrics)
+    _write_table(rows, METRIC_COLUMNS + [column for column in SWAP_COLUMNS if column in rows[0]], path)
+    _write_table(records, PROCESS_COLUMNS, processes_path(path))
+    return [path, processes_path(path)]
@@ -0,0 +1,118 @@
+import bisect
+from collections import deque
+from typing import Dict, Deque, Iterator, List, Optional
+
+INFINITY = float("inf")
+
+
+# Shared waiting queue that can hand a freed partition the best process that
+# fits it, instead of only the head of the queue. Entries are kept in arrival
+# order under a segment tree of minimum sizes, so the oldest entry that fits is
+# found in O(log n). Per-size FIFO buckets, with a sorted list of the sizes that
+# have waiting processes, find the largest entry that fits.
+# Sizes are resident sizes, the memory a process takes up in a partition.
+class FittingQueue:
+    def __init__(self):
+        self.entries: List[Optional["Process"]] = []
+        self.head = 0
+        self.count = 0
+        self.leaves = 1
+        self.min_size = [INFINITY, INFINITY]
+        self.buckets: Dict[int, Deque[int]] = {}
+        self.bucket_sizes: List[int] = []
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator["Process"]:
+        for position in range(self.head, len(self.entries)):
+            process = self.entries[position]
+            if process is not None:
+                yield process
+
+    def _set_size(self, position: int, size: float):
+        node = self.leaves + position
+        self.min_size[node] = size
+        node //= 2
+        while node:
+            self.min_size[node] = min(self.min_size[2 * node], self.min_size[2 * node + 1])
+            node //= 2
+
+    def _rebuild(self, leaves: int):
+        # Drops removed entries and renumbers the live ones from position 0
+        self.entries = list(self)
+        self.head = 0
+        self.leaves = leaves
+        self.min_size = [INFINITY] * (2 * leaves)
+        self.buckets = {}
+        for position, process in enumerate(self.entries):
+            self.min_size[leaves + position] = process.resident_size
+            self.buckets.setdefault(process.resident_size, deque()).append(position)
+        for node in range(leaves - 1, 0, -1):
+            self.min_size[node] = min(self.min_size[2 * node], self.min_size[2 * node + 1])
+        self.bucket_sizes = sorted(self.buckets)
+
+    def append(self, process: "Process"):
+        if len(self.entries) == self.leaves:
+            self._rebuild(self.leaves if 2 * self.count <= self.leaves else 2 * self.leaves)
+
+        position = len(self.entries)
+        self.entries.append(process)
+        self._set_size(position, process.resident_size)
+        bucket = self.buckets.get(process.resident_size)
+        if bucket is None:
+            bucket = self.buckets[process.resident_size] = deque()
+            bisect.insort(self.bucket_sizes, process.resident_size)
+        bucket.append(position)
+        self.count += 1
+
+    def _remove(self, position: int) -> "Process":
+        # Both pop orders always take the oldest entry of its size, so the
+        # position is at the head of its bucket
+        process = self.entries[position]
+        self.entries[position] = None
+        self._set_size(position, INFINITY)
+
+        bucket = self.buckets[process.resident_size]
+        bucket.popleft()
+        if not bucket:
+            del self.buckets[process.resident_size]
+            del self.bucket_sizes[bisect.bisect_left(self.bucket_sizes, process.resident_size)]
+
+        self.count -= 1
+        while self.head < len(self.entries) and self.entries[self.head] is None:
+            self.head += 1
+        return process
+
+    def oldest(self) -> Optional["Process"]:
+        if self.count:
+            return self.entries[self.head]
+        return None
+
+    def _oldest_fitting_position(self, capacity: int) -> int:
+        if self.min_size[1] > capacity:
+            return -1
+        node = 1
+        while node < self.leaves:
+            node *= 2
+            if self.min_size[node] > capacity:
+                node += 1
+        return node - self.leaves
+
+    def oldest_fitting(self, capacity: int) -> Optional["Process"]:
+        position = self._oldest_fitting_position(capacity)
+        if position < 0:
+            return None
+        return self.entries[position]
+
+    def pop_oldest_fitting(self, capacity: int) -> Optional["Process"]:
+        position = self._oldest_fitting_position(capacity)
+        if position < 0:
+            return None
+        return self._remove(position)
+
+    def pop_largest_fitting(self, capacity: int) -> Optional["Process"]:
+        i = bisect.bisect_right(self.bucket_sizes, capacity)
+        if i == 0:
+            return None
+        return self._remove(self.buckets[self.bucket_sizes[i - 1]][0])
@@ -0,0 +1,191 @@
+import collections
+import csv
+import math
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+# Timelines of a running simulation. Instrumentation is attached to a
+# Simulation and told after every event which partitions the event touched; it
+# then emits a sample for every metric whose value changed:
+#
+#   (time, metric, partition_id, value)
+#
+# with the per-partition metrics "occupancy" (MB in use), "queue_length"
+# (multi-queue only) and "internal_fragmentation" (size - currently_occupied
+# of a busy partition), and the global metrics (partition_id None)
+# "utilization" (share of memory in use), "internal_fragmentation" (MB) and
+# "queue_length" (processes waiting). A value holds until the next sample of
+# the same series. Samples go to one or more sinks. With interval > 0 the
+# partitions touched are collected and emitted at most once per interval of
+# virtual time, which bounds the sample rate on busy runs.
+
+Sample = Tuple[float, str, Optional[int], float]
+
+
+# Keeps the latest capacity samples in memory
+class RingBufferSink:
+    def __init__(self, capacity: int = 100000):
+        self.samples: Deque[Sample] = collections.deque(maxlen=capacity)
+
+    def write(self, sample: Sample):
+        self.samples.append(sample)
+
+    def close(self, end_time: float):
+        pass
+
+
+# Writes samples as CSV rows, buffered by the file object
+class FileSink:
+    def __init__(self, path: str, buffering: int = 1 << 20):
+        self.file = open(path, "w", newline="", buffering=buffering)
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(["time", "metric", "partition_id", "value"])
+
+    def write(self, sample: Sample):
+        self.writer.writerow(sample)
+
+    def close(self, end_time: float):
+        self.file.close()
+
+
+# Fixed-width bins of a value, each weighted by how long the value was held
+class Histogram:
+    def __init__(self, bin_width: float):
+        self.bin_width = bin_width
+        self.bins: Dict[int, float] = collections.defaultdict(float)
+        self.total_weight = 0.0
+        self.weighted_sum = 0.0
+        self.maximum = -math.inf
+
+    def add(self, value: float, weight: float):
+        self.maximum = max(self.maximum, value)
+        if weight <= 0:
+            return
+        self.bins[math.floor(value / self.bin_width)] += weight
+        self.total_weight += weight
+        self.weighted_sum += value * weight
+
+    def mean(self) -> float:
+        return self.weighted_sum / self.total_weight if self.total_weight else 0.0
+
+    def quantile(self, q: float) -> float:
+        # Upper edge of the bin the q-th share of the weight falls in
+        target = q * self.total_weight
+        seen = 0.0
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if seen >= target:
+                return (index + 1) * self.bin_width
+        return 0.0
+
+    def as_rows(self) -> List[Tuple[float, float]]:
+        return [(index * self.bin_width, self.bins[index]) for index in sorted(self.bins)]
+
+
+# Aggregates every series into a time-weighted histogram instead of keeping the
+# samples, so memory stays proportional to the number of series and bins
+class HistogramSink:
+    def __init__(self, bin_widths: Optional[Dict[str, float]] = None):
+        self.bin_widths = {"utilization": 0.01, "occupancy": 1.0, "queue_length": 1.0, "internal_fragmentation": 1.0}
+        self.bin_widths.update(bin_widths or {})
+        self.histograms: Dict[Tuple[str, Optional[int]], Histogram] = {}
+        self.last: Dict[Tuple[str, Optional[int]], Tuple[float, float]] = {}
+
+    def write(self, sample: Sample):
+        time, metric, partition_id, value = sample
+        key = (metric, partition_id)
+        if key in self.last:
+            since, held = self.last[key]
+            self.histogram(key).add(held, time - since)
+        self.last[key] = (time, value)
+
+    def close(self, end_time: float):
+        # Weights the last value of every series up to end_time
+        for key, (since, held) in self.last.items():
+            self.histogram(key).add(held, end_time - since)
+        self.last = {}
+
+    def summary(self) -> Dict[str, float]:
+        # Time-weighted means and peaks of the global series
+        summary = {}
+        for metric in ("utilization", "queue_length", "internal_fragmentation"):
+            histogram = self.histogram((metric, None))
+            summary[f"mean_{metric}"] = histogram.mean()
+            summary[f"peak_{metric}"] = max(histogram.maximum, 0)
+        return summary
+
+    def histogram(self, key: Tuple[str, Optional[int]]) -> Histogram:
+        if key not in self.histograms:
+            self.histograms[key] = Histogram(self.bin_widths.get(key[0], 1.0))
+        return self.histograms[key]
+
+
+class Instrumentation:
+    def __init__(self, sinks: Iterable, interval: float = 0.0):
+        self.sinks = list(sinks)
+        self.interval = interval
+        self.simulation = None
+
+    def start(self, simulation: "Simulation", clock: float):
+        self.simulation = simulation
+        self.single_queue = simulation.queue.use_single_queue
+        policy = simulation.policy
+        self.memory_size = policy.memory_size if policy.dynamic else sum(partition.size for partition in simulation.partitions)
+        # Last emitted value per series, and the running global sums
+        self.values: Dict[Tuple[str, Optional[int]], float] = {}
+        self.occupancy: Dict[int, Tuple[int, int, int]] = {}
+        self.used = 0
+        self.fragmentation = 0
+        self.queued = 0
+        self.pending: Dict[int, "Partition"] = {}
+        self.next_flush = clock
+        self.record(clock, simulation.partitions)
+
+    def _emit(self, clock: float, metric: str, partition_id: Optional[int], value: float):
+        key = (metric, partition_id)
+        if self.values.get(key) != value:
+            self.values[key] = value
+            for sink in self.sinks:
+                sink.write((clock, metric, partition_id, value))
+
+    def _update(self, clock: float, partition: "Partition"):
+        # A partition a dynamic policy has released no longer holds anything
+        released = partition.index is None
+        occupied = 0 if released else partition.currently_occupied
+        fragmentation = partition.size - occupied if partition.process is not None and not released else 0
+        queued = 0 if self.single_queue else len(partition.waiting_processes)
+
+        old_occupied, old_fragmentation, old_queued = self.occupancy.get(partition.partition_id, (0, 0, 0))
+        self.used += occupied - old_occupied
+        self.fragmentation += fragmentation - old_fragmentation
+        self.queued += queued - old_queued
+        self.occupancy[partition.partition_id] = (occupied, fragmentation, queued)
+
+        self._emit(clock, "occupancy", partition.partition_id, occupied)
+        self._emit(clock, "internal_fragmentation", partition.partition_id, fragmentation)
+        if not self.single_queue:
+            self._emit(clock, "queue_length", partition.partition_id, queued)
+
+    def record(self, clock: float, partitions: Iterable["Partition"]):
+        if self.interval > 0:
+            for partition in partitions:
+                self.pending[partition.partition_id] = partition
+            if clock < self.next_flush:
+                return
+            partitions = list(self.pending.values())
+            self.pending.clear()
+            self.next_flush = clock + self.interval
+
+        for partition in partitions:
+            self._update(clock, partition)
+        if self.single_queue:
+            self.queued = len(self.simulation.queue.waiting_processes)
+        self._emit(clock, "utilization", None, self.used / self.memory_size if self.memory_size else 0.0)
+        self._emit(clock, "internal_fragmentation", None, self.fragmentation)
+        self._emit(clock, "queue_length", None, self.queued)
+
+    def finish(self, clock: float):
+        if self.pending:
+            self.next_flush = clock
+            self.record(clock, [])
+        for sink in self.sinks:
+            sink.close(clock)
@@ -0,0 +1,109 @@
+import argparse
+import functools
+import random
+from typing import Callable, Dict, Iterable, Sequence
+
+from MainProgram import (
+    Simulation,
+    generate_bursty_arrivals,
+    generate_poisson_arrivals,
+    generate_random_partitions,
+    generate_random_processes,
+)
+from partition_index import PLACEMENT_POLICIES
+from sweep import DYNAMIC_PLACEMENTS, PLACEMENTS, QUEUE_MODES
+
+ARRIVAL_GENERATORS = {
+    "poisson": generate_poisson_arrivals,
+    "bursty": generate_bursty_arrivals,
+}
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    # Linear interpolation between the closest ranks
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * q / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+def latency_percentiles(waiting_times: Iterable[float], percentiles=(50, 95, 99)) -> Dict[str, float]:
+    values = sorted(waiting_times)
+    return {f"p{q}": percentile(values, q) for q in percentiles}
+
+
+def build_simulation(memory_size: int, partition_count: int, layout_seed: int, queue_mode: str, placement: str) -> Simulation:
+    if placement in DYNAMIC_PLACEMENTS:
+        return Simulation([], QUEUE_MODES[queue_mode](), DYNAMIC_PLACEMENTS[placement](memory_size))
+    partitions, _ = generate_random_partitions(partition_count, memory_size, random.Random(layout_seed))
+    return Simulation(partitions, QUEUE_MODES[queue_mode](), PLACEMENT_POLICIES[placement])
+
+
+def run_load(make_simulation: Callable[[], Simulation], arrival: str, arrival_rate: float, process_count: int, seed: int):
+    simulation = make_simulation()
+    arrivals = ARRIVAL_GENERATORS[arrival](process_count, arrival_rate, rng=random.Random(seed))
+    totals = simulation.simulate_execution(verbose=False, arrivals=arrivals)
+    return simulation, totals
+
+
+def saturation_throughput(make_simulation: Callable[[], Simulation], process_count: int, seed: int) -> float:
+    # With every process waiting from t=0 the partitions never idle while
+    # work they can take is queued, so this is the most the layout can sustain
+    simulation = make_simulation()
+    simulation.allocate(generate_random_processes(process_count, random.Random(seed)))
+    _, total_running_time, _ = simulation.simulate_execution(verbose=False)
+    return simulation.completed / total_running_time if total_running_time else 0.0
+
+
+def sustainable_rate(make_simulation: Callable[[], Simulation], arrival: str, process_count: int, seed: int,
+                     latency_target: float, percentile_target: int = 95, iterations: int = 12) -> float:
+    # Bisects for the highest arrival rate whose waiting-time percentile stays
+    # within latency_target, between 0 and the saturation throughput
+    low, high = 0.0, saturation_throughput(make_simulation, process_count, seed)
+    for _ in range(iterations):
+        rate = (low + high) / 2
+        if rate <= 0:
+            break
+        simulation, _ = run_load(make_simulation, arrival, rate, process_count, seed)
+        if latency_percentiles(simulation.waiting_times, (percentile_target,))[f"p{percentile_target}"] <= latency_target:
+            low = rate
+        else:
+            high = rate
+    return low
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure queueing latency and sustainable arrival rate under online load")
+    parser.add_argument("--memory-size", type=int, required=True, help="memory size (MB)")
+    parser.add_argument("--partition-count", type=int, default=10, help="number of random fixed partitions")
+    parser.add_argument("--layouts", type=int, default=3, help="number of random partition layouts (seeds 0..N-1)")
+    parser.add_argument("--queue-mode", choices=list(QUEUE_MODES), default="single", help="queue strategy")
+    parser.add_argument("--placement", choices=PLACEMENTS, default="best", help="placement policy")
+    parser.add_argument("--arrivals", choices=list(ARRIVAL_GENERATORS), default="poisson", help="arrival process")
+    parser.add_argument("--arrival-rate", type=float, default=1.0, help="mean arrivals per second")
+    parser.add_argument("--processes", type=int, default=10000, help="processes per run")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the workload")
+    parser.add_argument("--latency-target", type=float, default=10.0,
+                        help="p95 waiting time (seconds) a sustainable arrival rate must stay within")
+    args = parser.parse_args()
+    # Dynamic policies create partitions on demand, which multi-queue mode
+    # cannot queue on
+    if args.queue_mode == "multi" and args.placement in DYNAMIC_PLACEMENTS:
+        parser.error(f"--placement {args.placement} needs a single queue, not --queue-mode multi")
+
+    print(f"{'Layout':<8}{'p50':>10}{'p95':>10}{'p99':>10}{'Saturation':>12}{'Sustainable':>13}")
+    for layout_seed in range(args.layouts):
+        make_simulation = functools.partial(build_simulation, args.memory_size, args.partition_count, layout_seed,
+                                            args.queue_mode, args.placement)
+        simulation, _ = run_load(make_simulation, args.arrivals, args.arrival_rate, args.processes, args.seed)
+        latencies = latency_percentiles(simulation.waiting_times)
+        saturation = saturation_throughput(make_simulation, args.processes, args.seed)
+        sustainable = sustainable_rate(make_simulation, args.arrivals, args.processes, args.seed, args.latency_target)
+        print(f"{layout_seed:<8}{latencies['p50']:>10.2f}{latencies['p95']:>10.2f}{latencies['p99']:>10.2f}"
+              f"{saturation:>12.3f}{sustainable:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+import argparse
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+from typing import Dict, List, Optional, Tuple
+
+from MainProgram import (
+    Simulation,
+    calculate_time_utilization,
+    generate_random_partitions,
+    generate_random_processes,
+    plot_comparison,
+)
+from partition_index import PLACEMENT_POLICIES
+from sweep import QUEUE_MODES
+
+# Monte Carlo comparison of two queue strategies. Every replication draws one
+# workload (processes and partition layout) from its own seed and runs both
+# strategies on it, so the strategies are compared on paired samples. The
+# replications run in parallel batches until the confidence interval of the
+# paired difference in the target metric is narrow enough.
+
+METRICS = ["execution_time", "running_time", "waiting_time", "utilization", "throughput", "mean_waiting_time"]
+
+
+def t_quantile(p: float, degrees_of_freedom: int) -> float:
+    # Student t quantile from the normal one (Hill's expansion), within 1% from
+    # 3 degrees of freedom up
+    z = NormalDist().inv_cdf(p)
+    v = degrees_of_freedom
+    return (z + (z ** 3 + z) / (4 * v) + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * v ** 2)
+            + (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / (384 * v ** 3))
+
+
+# Running mean and variance (Welford), so replications need not be kept
+class RunningStats:
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def half_width(self, confidence: float = 0.95) -> float:
+        if self.count < 2:
+            return math.inf
+        standard_error = math.sqrt(self.m2 / (self.count - 1) / self.count)
+        return t_quantile((1 + confidence) / 2, self.count - 1) * standard_error
+
+
+def replicate(seed: int, memory_size: int, partition_count: int, process_count: Optional[int],
+              modes: Tuple[str, str], placement: str) -> Dict[str, Dict[str, float]]:
+    # One workload, generated once and run by both strategies
+    rng = random.Random(seed)
+    processes = generate_random_processes(process_count or rng.randint(10, 20), rng)
+    partitions, _ = generate_random_partitions(partition_count, memory_size, rng)
+
+    results = {}
+    for mode in modes:
+        simulation = Simulation([partition.copy() for partition in partitions], QUEUE_MODES[mode](), PLACEMENT_POLICIES[placement])
+        simulation.allocate([process.copy() for process in processes])
+        total_execution_time, total_running_time, total_waiting_time = simulation.simulate_execution(verbose=False)
+        results[mode] = {
+            "execution_time": total_execution_time,
+            "running_time": total_running_time,
+            "waiting_time": total_waiting_time,
+            "utilization": calculate_time_utilization(total_execution_time, total_running_time, simulation.concurrency()),
+            "throughput": simulation.completed / total_running_time if total_running_time else 0.0,
+            "mean_waiting_time": total_waiting_time / simulation.completed if simulation.completed else 0.0,
+        }
+    return results
+
+
+def replicate_batch(seeds: List[int], *args) -> List[Dict[str, Dict[str, float]]]:
+    return [replicate(seed, *args) for seed in seeds]
+
+
+class Comparison:
+    def __init__(self, baseline: str, candidate: str):
+        self.baseline = baseline
+        self.candidate = candidate
+        self.stats = {(mode, metric): RunningStats() for mode in (baseline, candidate) for metric in METRICS}
+        self.differences = {metric: RunningStats() for metric in METRICS}
+
+    def add(self, result: Dict[str, Dict[str, float]]):
+        for metric in METRICS:
+            self.stats[(self.baseline, metric)].add(result[self.baseline][metric])
+            self.stats[(self.candidate, metric)].add(result[self.candidate][metric])
+            self.differences[metric].add(result[self.candidate][metric] - result[self.baseline][metric])
+
+    @property
+    def replications(self) -> int:
+        return self.differences[METRICS[0]].count
+
+    def precise_enough(self, metric: str, precision: float, confidence: float) -> bool:
+        # The half-width of the paired difference, relative to the baseline mean
+        scale = abs(self.stats[(self.baseline, metric)].mean)
+        if scale == 0:
+            return self.differences[metric].half_width(confidence) == 0
+        return self.differences[metric].half_width(confidence) / scale <= precision
+
+    def print(self, confidence: float):
+        print(f"{self.replications} replications, {confidence:.0%} confidence intervals")
+        print(f"{'Metric':<20}{self.baseline:>26}{self.candidate:>26}{'Difference':>26}")
+        for metric in METRICS:
+            cells = []
+            for stats in (self.stats[(self.baseline, metric)], self.stats[(self.candidate, metric)], self.differences[metric]):
+                cells.append(f"{stats.mean:.3f} ± {stats.half_width(confidence):.3f}")
+            print(f"{metric:<20}{cells[0]:>26}{cells[1]:>26}{cells[2]:>26}")
+
+
+def compare(memory_size: int, partition_count: int, process_count: Optional[int] = None,
+            baseline: str = "multi", candidate: str = "single", placement: str = "best",
+            target_metric: str = "mean_waiting_time", precision: float = 0.05, confidence: float = 0.95,
+            min_replications: int = 10, max_replications: int = 10000, batch_size: int = 32,
+            workers: Optional[int] = None, first_seed: int = 0, verbose: bool = False) -> Comparison:
+    comparison = Comparison(baseline, candidate)
+    args = (memory_size, partition_count, process_count, (baseline, candidate), placement)
+    workers = workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    seed = first_seed
+    try:
+        while comparison.replications < max_replications:
+            # One round is a batch per worker, replicated in parallel
+            count = min(batch_size * workers, max_replications - comparison.replications)
+            batches = [list(range(start, min(start + batch_size, seed + count)))
+                       for start in range(seed, seed + count, batch_size)]
+            seed += count
+            if executor is None:
+                results = [replicate_batch(batch, *args) for batch in batches]
+            else:
+                results = executor.map(replicate_batch, batches, *[[arg] * len(batches) for arg in args])
+            # Added in seed order
+            for batch_results in results:
+                for result in batch_results:
+                    comparison.add(result)
+            if verbose:
+                difference = comparison.differences[target_metric]
+                print(f"{comparison.replications} replications: {target_metric} difference "
+                      f"{difference.mean:.3f} ± {difference.half_width(confidence):.3f}")
+            if comparison.replications >= min_replications and comparison.precise_enough(target_metric, precision, confidence):
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two queue strategies over seeded replications with confidence intervals")
+    parser.add_argument("--memory-size", type=int, required=True, help="memory size (MB)")
+    parser.add_argument("--partition-count", type=int, required=True, help="number of partitions")
+    parser.add_argument("--processes", type=int, default=None, help="processes per replication (default: 10 to 20, as in MainProgram)")
+    parser.add_argument("--baseline", choices=list(QUEUE_MODES), default="multi", help="baseline queue strategy")
+    parser.add_argument("--candidate", choices=list(QUEUE_MODES), default="single", help="queue strategy compared to the baseline")
+    parser.add_argument("--placement", choices=list(PLACEMENT_POLICIES), default="best", help="placement policy")
+    parser.add_argument("--target-metric", choices=METRICS, default="mean_waiting_time",
+                        help="metric whose paired difference decides when to stop")
+    parser.add_argument("--precision", type=float, default=0.05,
+                        help="stop once the difference's half-width is within this share of the baseline mean")
+    parser.add_argument("--confidence", type=float, default=0.95, help="confidence level of the intervals")
+    parser.add_argument("--min-replications", type=int, default=10, help="replications before stopping is considered")
+    parser.add_argument("--max-replications", type=int, default=10000, help="upper bound on replications")
+    parser.add_argument("--batch-size", type=int, default=32, help="replications per submitted task")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--first-seed", type=int, default=0, help="seed of the first replication")
+    parser.add_argument("--plot-file", default=None, help="render the means with their intervals to this image file")
+    parser.add_argument("--verbose", action="store_true", help="print the interval after every round")
+    args = parser.parse_args()
+
+    if args.memory_size < 10 * args.partition_count:
+        parser.error("memory size must be at least 10MB per partition")
+    comparison = compare(args.memory_size, args.partition_count, args.processes, args.baseline, args.candidate,
+                         args.placement, args.target_metric, args.precision, args.confidence, args.min_replications,
+                         args.max_replications, args.batch_size, args.workers, args.first_seed, args.verbose)
+    comparison.print(args.confidence)
+
+    if args.plot_file:
+        plotted = ["execution_time", "running_time", "waiting_time", "utilization"]
+        means = {mode: {metric: comparison.stats[(mode, metric)].mean for metric in plotted} for mode in (args.baseline, args.candidate)}
+        errors = {mode: [comparison.stats[(mode, metric)].half_width(args.confidence) for metric in plotted]
+                  for mode in (args.baseline, args.candidate)}
+        plot_comparison(means[args.candidate], means[args.baseline], args.plot_file,
+                        errors[args.candidate], errors[args.baseline], (args.candidate, args.baseline))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+import argparse
+import bisect
+import json
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from latency import percentile
+from MainProgram import Partition, Process, Simulation, generate_random_processes
+from partition_index import PLACEMENT_POLICIES
+from sweep import QUEUE_MODES
+from traces import read_trace
+
+# Searches for the fixed partition layout (partition sizes, in address order)
+# that serves a workload best, with the discrete-event simulator as the
+# objective. The search is simulated annealing: every step evaluates a batch of
+# neighbouring layouts in parallel and moves to the best of them, accepting a
+# worse one with a probability that falls as the temperature cools. Candidates
+# are first screened on a prefix of the workload, and those clearly worse than
+# the incumbent there are dropped without a full simulation.
+
+# (size, time_needed, arrival_time) per process, in arrival order
+Workload = List[Tuple[int, float, float]]
+Layout = Tuple[int, ...]
+
+OBJECTIVES = {
+    # Lower is better
+    "mean-wait": lambda metrics: metrics["mean_waiting_time"],
+    "p95-wait": lambda metrics: metrics["p95_waiting_time"],
+    "throughput": lambda metrics: -metrics["throughput"],
+}
+
+MIN_PARTITION_SIZE = 10
+
+
+def evaluate(layout: Layout, workload: Workload, queue_mode: str = "single", placement: str = "best") -> Dict:
+    partitions = [Partition(size, i + 1) for i, size in enumerate(layout)]
+    simulation = Simulation(partitions, QUEUE_MODES[queue_mode](), PLACEMENT_POLICIES[placement])
+    arrivals = (Process(size, i + 1, time_needed, arrival_time) for i, (size, time_needed, arrival_time) in enumerate(workload))
+    total_execution_time, total_running_time, total_waiting_time = simulation.simulate_execution(verbose=False, arrivals=arrivals)
+    return {
+        "completed": simulation.completed,
+        "running_time": total_running_time,
+        "mean_waiting_time": total_waiting_time / simulation.completed if simulation.completed else 0.0,
+        "p95_waiting_time": percentile(sorted(simulation.waiting_times), 95),
+        "throughput": simulation.completed / total_running_time if total_running_time else 0.0,
+    }
+
+
+def score(metrics: Dict, objective: str, process_count: int) -> float:
+    # A layout that leaves processes unfinished is never better than one that
+    # runs them all, however short its waits
+    if metrics["completed"] < process_count:
+        return math.inf
+    return OBJECTIVES[objective](metrics)
+
+
+# Worker processes receive the workload once, through the pool initializer
+_worker_state: Dict = {}
+
+
+def _init_worker(workload: Workload, screen_count: int, queue_mode: str, placement: str, objective: str):
+    _worker_state.update(workload=workload, screen=workload[:screen_count], queue_mode=queue_mode,
+                         placement=placement, objective=objective)
+
+
+def _evaluate_candidate(layout: Layout, screen_limit: float) -> Tuple[Layout, Optional[float], Optional[Dict]]:
+    # Returns (layout, screening score, full metrics), the metrics being None
+    # when the screening score is above screen_limit
+    state = _worker_state
+    screen_score = None
+    if len(state["screen"]) < len(state["workload"]):
+        screen_metrics = evaluate(layout, state["screen"], state["queue_mode"], state["placement"])
+        screen_score = score(screen_metrics, state["objective"], len(state["screen"]))
+        if screen_score > screen_limit:
+            return layout, screen_score, None
+    return layout, screen_score, evaluate(layout, state["workload"], state["queue_mode"], state["placement"])
+
+
+def bucket_layout(workload: Workload, partition_count: int, memory_size: int) -> Layout:
+    # Size classes from the job-size distribution: partition i is as large as
+    # the (i + 1) / partition_count quantile of the job sizes, so each class of
+    # jobs has a partition that just fits it. Memory left over goes to the
+    # classes in proportion to the work (size x time) they hold.
+    sizes = sorted(size for size, _, _ in workload)
+    bounds = [sizes[min(len(sizes) - 1, math.ceil((i + 1) * len(sizes) / partition_count) - 1)] for i in range(partition_count)]
+    bounds = [max(bound, MIN_PARTITION_SIZE) for bound in bounds]
+    if sum(bounds) > memory_size:
+        scale = memory_size / sum(bounds)
+        bounds = [max(MIN_PARTITION_SIZE, int(bound * scale)) for bound in bounds]
+        # Keep the largest class able to run the largest job
+        bounds[-1] = min(max(bounds[-1], sizes[-1]), memory_size - sum(bounds[:-1]))
+        return tuple(bounds)
+
+    work = [0.0] * partition_count
+    for size, time_needed, _ in workload:
+        work[min(bisect.bisect_left(bounds, size), partition_count - 1)] += size * time_needed
+    spare = memory_size - sum(bounds)
+    total_work = sum(work) or 1.0
+    layout = [bound + int(spare * share / total_work) for bound, share in zip(bounds, work)]
+    return tuple(layout)
+
+
+def random_layout(partition_count: int, memory_size: int, largest_job: int, rng: random.Random) -> Layout:
+    # Random cut points of the memory, with the first partition large enough
+    # for every job
+    spare = memory_size - MIN_PARTITION_SIZE * partition_count - max(largest_job - MIN_PARTITION_SIZE, 0)
+    cuts = sorted(rng.randint(0, spare) for _ in range(partition_count - 1))
+    shares = [b - a for a, b in zip([0] + cuts, cuts + [spare])]
+    layout = [MIN_PARTITION_SIZE + share for share in shares]
+    layout[0] += max(largest_job - MIN_PARTITION_SIZE, 0)
+    return tuple(layout)
+
+
+def neighbour(layout: Layout, largest_job: int, step: int, rng: random.Random) -> Layout:
+    # Moves up to step MB from one partition to another, or swaps two
+    # partitions (which matters to the address-ordered policies)
+    layout = list(layout)
+    for _ in range(100):
+        source, target = rng.sample(range(len(layout)), 2)
+        if rng.random() < 0.1:
+            layout[source], layout[target] = layout[target], layout[source]
+            return tuple(layout)
+        amount = rng.randint(1, step)
+        if layout[source] - amount < MIN_PARTITION_SIZE:
+            continue
+        candidate = layout[:]
+        candidate[source] -= amount
+        candidate[target] += amount
+        if max(candidate) >= largest_job:
+            return tuple(candidate)
+    return tuple(layout)
+
+
+def optimize(workload: Workload, memory_size: int, partition_count: int, queue_mode: str = "single",
+             placement: str = "best", objective: str = "mean-wait", iterations: int = 100, candidates: int = 8,
+             workers: Optional[int] = None, seed: int = 0, warm_start: str = "bucket", step: Optional[int] = None,
+             screen_fraction: float = 0.25, cutoff: float = 1.25, initial_temperature: float = 0.05,
+             cooling: float = 0.97, verbose: bool = False) -> Tuple[Layout, Dict]:
+    rng = random.Random(seed)
+    largest_job = max(size for size, _, _ in workload)
+    if partition_count < 2 or memory_size < MIN_PARTITION_SIZE * (partition_count - 1) + max(largest_job, MIN_PARTITION_SIZE):
+        raise ValueError("Memory too small for the partition count and the largest job")
+    step = step or max(1, memory_size // (4 * partition_count))
+    screen_count = max(1, int(len(workload) * screen_fraction))
+
+    current = bucket_layout(workload, partition_count, memory_size) if warm_start == "bucket" else \
+        random_layout(partition_count, memory_size, largest_job, rng)
+    if max(current) < largest_job or sum(current) > memory_size:
+        current = random_layout(partition_count, memory_size, largest_job, rng)
+
+    _init_worker(workload, screen_count, queue_mode, placement, objective)
+    _, current_screen, current_metrics = _evaluate_candidate(current, math.inf)
+    current_score = score(current_metrics, objective, len(workload))
+    best, best_score, best_metrics = current, current_score, current_metrics
+    seen = {current}
+    temperature = initial_temperature
+
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                   initargs=(workload, screen_count, queue_mode, placement, objective)) if workers != 1 else None
+    try:
+        for iteration in range(iterations):
+            batch = []
+            for _ in range(candidates):
+                layout = neighbour(current, largest_job, step, rng)
+                if layout not in seen:
+                    seen.add(layout)
+                    batch.append(layout)
+            if not batch:
+                continue
+
+            # Screening compares against the incumbent's own screening score
+            screen_limit = math.inf
+            if current_screen is not None and math.isfinite(current_screen):
+                screen_limit = current_screen + abs(current_screen) * (cutoff - 1)
+            if executor is None:
+                results = [_evaluate_candidate(layout, screen_limit) for layout in batch]
+            else:
+                results = list(executor.map(_evaluate_candidate, batch, [screen_limit] * len(batch)))
+
+            evaluated = [(score(metrics, objective, len(workload)), layout, screen_score, metrics)
+                         for layout, screen_score, metrics in results if metrics is not None]
+            if not evaluated:
+                temperature *= cooling
+                continue
+            # Ties go to the earliest candidate, so the search does not depend on workers
+            candidate_score, layout, screen_score, metrics = min(evaluated, key=lambda item: item[0])
+
+            if candidate_score <= current_score or (
+                    math.isfinite(candidate_score) and math.isfinite(current_score) and current_score != 0
+                    and rng.random() < math.exp(-(candidate_score - current_score) / (abs(current_score) * temperature))):
+                current, current_score, current_screen = layout, candidate_score, screen_score
+                if candidate_score < best_score:
+                    best, best_score, best_metrics = layout, candidate_score, metrics
+            temperature *= cooling
+            if verbose:
+                print(f"Iteration {iteration + 1}: {len(evaluated)}/{len(batch)} fully evaluated, "
+                      f"current {current_score:.4f}, best {best_score:.4f}")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return best, best_metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search for the fixed partition layout that serves a workload best")
+    parser.add_argument("--memory-size", type=int, required=True, help="memory size (MB)")
+    parser.add_argument("--partition-count", type=int, required=True, help="number of partitions")
+    parser.add_argument("--trace", default=None, help="workload trace (.csv, .jsonl or .bin); random processes otherwise")
+    parser.add_argument("--processes", type=int, default=1000, help="number of random processes")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the random workload and the search")
+    parser.add_argument("--queue-mode", choices=list(QUEUE_MODES), default="single", help="queue strategy")
+    parser.add_argument("--placement", choices=list(PLACEMENT_POLICIES), default="best", help="placement policy")
+    parser.add_argument("--objective", choices=list(OBJECTIVES), default="mean-wait", help="what to optimize")
+    parser.add_argument("--iterations", type=int, default=100, help="annealing steps")
+    parser.add_argument("--candidates", type=int, default=8, help="neighbouring layouts evaluated per step")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--warm-start", choices=["bucket", "random"], default="bucket",
+                        help="start from size classes of the job-size distribution, or from a random layout")
+    parser.add_argument("--screen-fraction", type=float, default=0.25,
+                        help="share of the workload candidates are screened on before a full run")
+    parser.add_argument("--cutoff", type=float, default=1.25,
+                        help="drop candidates whose screening score is this many times the incumbent's")
+    parser.add_argument("--output", default=None, help="write the best layout and its metrics to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="print the progress of every step")
+    args = parser.parse_args()
+
+    if args.trace:
+        workload = [(process.size, process.time_needed, process.arrival_time) for process in read_trace(args.trace)]
+    else:
+        workload = [(process.size, process.time_needed, 0.0)
+                    for process in generate_random_processes(args.processes, random.Random(args.seed))]
+
+    layout, metrics = optimize(workload, args.memory_size, args.partition_count, args.queue_mode, args.placement,
+                               args.objective, args.iterations, args.candidates, args.workers, args.seed,
+                               args.warm_start, screen_fraction=args.screen_fraction, cutoff=args.cutoff,
+                               verbose=args.verbose)
+    print(f"Best layout: {list(layout)} ({sum(layout)}MB of {args.memory_size}MB)")
+    print(f"Completed Processes: {metrics['completed']}")
+    print(f"Mean Waiting Time: {metrics['mean_waiting_time']:.2f} seconds")
+    print(f"p95 Waiting Time: {metrics['p95_waiting_time']:.2f} seconds")
+    print(f"Throughput: {metrics['throughput']:.4f} processes/second")
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"layout": list(layout), "metrics": metrics}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
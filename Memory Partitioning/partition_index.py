@@ -0,0 +1,251 @@
+import bisect
+from typing import List, Optional
+
+
+# Placement policies over a fixed set of partitions. Every policy answers two
+# queries for the simulator: find(size), the partition a process of that size
+# belongs to whether or not it is busy (multi-queue), and find_free(size), a
+# free partition it can run in right now (single queue). Partitions report
+# occupancy changes through mark_busy/mark_free, which Partition calls on its
+# own. All queries are O(log N).
+#
+# scan_counter, if set (profiling.Profiler.attach does), is told through
+# scanned(count) how many index entries each query examined: bisect probes and
+# segment tree nodes, or partitions for the linear scan.
+
+
+def bisect_probes(length: int, position: int) -> int:
+    # Comparisons bisect_left made on a list of length items to return position
+    low, high, probes = 0, length, 0
+    while low < high:
+        middle = (low + high) // 2
+        probes += 1
+        if middle < position:
+            low = middle + 1
+        else:
+            high = middle
+    return probes
+
+
+# Max segment tree with a "leftmost position at or after start holding at least
+# value" query, shared by the policies below.
+class MaxSegmentTree:
+    def __init__(self, values: List[int]):
+        self.size = len(values)
+        self.leaves = 1
+        while self.leaves < self.size:
+            self.leaves *= 2
+        self.tree = [-1] * (2 * self.leaves)
+        self.tree[self.leaves:self.leaves + self.size] = values
+        for node in range(self.leaves - 1, 0, -1):
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+
+    def update(self, position: int, value: int):
+        node = self.leaves + position
+        if self.tree[node] == value:
+            return
+        self.tree[node] = value
+        node //= 2
+        while node:
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+            node //= 2
+
+    def maximum(self) -> int:
+        return self.tree[1]
+
+    def first_at_least(self, value: int, start: int = 0) -> int:
+        if start >= self.size:
+            return -1
+        node = self.leaves + start
+        if self.tree[node] < value:
+            # Climb until a right sibling holds a large enough value
+            while node > 1:
+                if node % 2 == 0 and self.tree[node + 1] >= value:
+                    node += 1
+                    break
+                node //= 2
+            else:
+                return -1
+            # Descend to the leftmost such leaf of that subtree
+            while node < self.leaves:
+                node *= 2
+                if self.tree[node] < value:
+                    node += 1
+        return node - self.leaves
+
+    def visits(self, start: int, position: int) -> int:
+        # Nodes first_at_least(value, start) visited to return position. A
+        # search climbs from the start leaf to the level below the lowest
+        # common ancestor with the leaf it finds and descends again, so the
+        # count follows from the two positions.
+        if start >= self.size:
+            return 0
+        leaf = self.leaves + start
+        if position == start:
+            return 1
+        if position < 0:
+            return leaf.bit_length()
+        return 2 * (leaf ^ (self.leaves + position)).bit_length()
+
+
+# Best fit. Partitions are kept in a sorted array keyed on size, and a segment
+# tree of free flags over that array finds the first free partition at or after
+# the smallest one that fits without scanning.
+class PartitionIndex:
+    dynamic = False
+    scan_counter = None
+
+    def __init__(self, partitions: List["Partition"]):
+        # Stable sort, so equal sizes keep the same order as partitions.sort()
+        self.partitions = sorted(partitions, key=lambda x: x.size)
+        self.sizes = [partition.size for partition in self.partitions]
+        for position, partition in enumerate(self.partitions):
+            partition.index = self
+            partition.index_position = position
+        self.free = MaxSegmentTree([1 if partition.process is None else 0 for partition in self.partitions])
+
+    def mark_busy(self, partition: "Partition"):
+        self.free.update(partition.index_position, 0)
+
+    def mark_free(self, partition: "Partition"):
+        self.free.update(partition.index_position, 1)
+
+    def find(self, size: int) -> Optional["Partition"]:
+        position = bisect.bisect_left(self.sizes, size)
+        if self.scan_counter is not None:
+            self.scan_counter.scanned(bisect_probes(len(self.sizes), position))
+        if position < len(self.partitions):
+            return self.partitions[position]
+        return None
+
+    def find_free(self, size: int) -> Optional["Partition"]:
+        start = bisect.bisect_left(self.sizes, size)
+        position = self.free.first_at_least(1, start)
+        if self.scan_counter is not None:
+            self.scan_counter.scanned(bisect_probes(len(self.sizes), start) + self.free.visits(start, position))
+        if position >= 0:
+            return self.partitions[position]
+        return None
+
+
+# Base for the policies that look at partitions in address (partition id)
+# order. One tree holds every partition size, the other the sizes of the free
+# partitions with -1 for busy ones.
+class AddressOrderIndex:
+    dynamic = False
+    scan_counter = None
+
+    def __init__(self, partitions: List["Partition"]):
+        self.partitions = sorted(partitions, key=lambda x: x.partition_id)
+        for position, partition in enumerate(self.partitions):
+            partition.index = self
+            partition.index_position = position
+        self.sizes = MaxSegmentTree([partition.size for partition in self.partitions])
+        self.free = MaxSegmentTree([partition.size if partition.process is None else -1 for partition in self.partitions])
+
+    def mark_busy(self, partition: "Partition"):
+        self.free.update(partition.index_position, -1)
+
+    def mark_free(self, partition: "Partition"):
+        self.free.update(partition.index_position, partition.size)
+
+    def _lookup(self, tree: MaxSegmentTree, size: int) -> Optional["Partition"]:
+        position = tree.first_at_least(size)
+        if self.scan_counter is not None:
+            self.scan_counter.scanned(tree.visits(0, position))
+        if position >= 0:
+            return self.partitions[position]
+        return None
+
+    def find(self, size: int) -> Optional["Partition"]:
+        return self._lookup(self.sizes, size)
+
+    def find_free(self, size: int) -> Optional["Partition"]:
+        return self._lookup(self.free, size)
+
+
+# First fit: the lowest-addressed partition that fits.
+class FirstFitIndex(AddressOrderIndex):
+    pass
+
+
+# Next fit: like first fit, but each search resumes from the partition chosen
+# last and wraps around.
+class NextFitIndex(AddressOrderIndex):
+    def __init__(self, partitions: List["Partition"]):
+        super().__init__(partitions)
+        self.cursor = 0
+
+    def _lookup(self, tree: MaxSegmentTree, size: int) -> Optional["Partition"]:
+        position = tree.first_at_least(size, self.cursor)
+        if self.scan_counter is not None:
+            self.scan_counter.scanned(tree.visits(self.cursor, position))
+        if position < 0:
+            position = tree.first_at_least(size)
+            if self.scan_counter is not None:
+                self.scan_counter.scanned(tree.visits(0, position))
+        if position < 0:
+            return None
+        self.cursor = position
+        return self.partitions[position]
+
+
+# Worst fit: the largest partition, if the process fits in it. Ties go to the
+# lowest address.
+class WorstFitIndex(AddressOrderIndex):
+    def _lookup(self, tree: MaxSegmentTree, size: int) -> Optional["Partition"]:
+        if tree.maximum() < size:
+            if self.scan_counter is not None:
+                self.scan_counter.scanned(1)
+            return None
+        position = tree.first_at_least(tree.maximum())
+        if self.scan_counter is not None:
+            self.scan_counter.scanned(1 + tree.visits(0, position))
+        return self.partitions[position]
+
+
+# Reference implementation of best fit with the original linear scan. verify.py
+# checks that PartitionIndex gives the same placements.
+class LinearPartitionIndex:
+    dynamic = False
+    scan_counter = None
+
+    def __init__(self, partitions: List["Partition"]):
+        self.partitions = sorted(partitions, key=lambda x: x.size)
+        for position, partition in enumerate(self.partitions):
+            partition.index = self
+            partition.index_position = position
+
+    def mark_busy(self, partition: "Partition"):
+        pass
+
+    def mark_free(self, partition: "Partition"):
+        pass
+
+    def find(self, size: int) -> Optional["Partition"]:
+        for scanned, partition in enumerate(self.partitions, 1):
+            if size <= partition.size:
+                self._scanned(scanned)
+                return partition
+        self._scanned(len(self.partitions))
+        return None
+
+    def find_free(self, size: int) -> Optional["Partition"]:
+        for scanned, partition in enumerate(self.partitions, 1):
+            if size <= partition.size and partition.process is None:
+                self._scanned(scanned)
+                return partition
+        self._scanned(len(self.partitions))
+        return None
+
+    def _scanned(self, count: int):
+        if self.scan_counter is not None:
+            self.scan_counter.scanned(count)
+
+
+PLACEMENT_POLICIES = {
+    "first": FirstFitIndex,
+    "next": NextFitIndex,
+    "best": PartitionIndex,
+    "worst": WorstFitIndex,
+}
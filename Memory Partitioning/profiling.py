@@ -0,0 +1,134 @@
+import collections
+import contextlib
+import cProfile
+import os
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+# Per-phase timers and counters of a simulation run. A Profiler passed to
+# Simulation(..., profiler=...) times placement, queue operations and the rest
+# of the execution loop, and counts placements, the index entries the
+# placement policy examined ("scans": bisect probes, segment tree nodes, buddy
+# free lists or linearly scanned partitions), queue pushes and pops and the
+# deepest the waiting queues got. phase() times anything else, such as workload
+# generation. metrics() returns it all as a dict like single_queue_data.
+#
+# cprofile=True also runs cProfile over the profiled code, and
+# sample_interval=S samples the profiled thread's current function every S
+# seconds from a background thread. Without a profiler the simulation pays a
+# single None check per placement and release, and the policy one per query.
+
+PHASES = ["generation", "placement", "queue", "execution"]
+
+
+class Profiler:
+    def __init__(self, cprofile: bool = False, sample_interval: Optional[float] = None):
+        self.times: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.placements = 0
+        self.queue_pushes = 0
+        self.queue_pops = 0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        # None while no attached policy reports its scans
+        self.scans: Optional[int] = None
+        self.profile = cProfile.Profile() if cprofile else None
+        self.sample_interval = sample_interval
+        self.samples = collections.Counter()
+        self.depth = 0
+        self.sampler: Optional[threading.Thread] = None
+        self.sampling = threading.Event()
+
+    def attach(self, policy):
+        # Counts the policy's scans from now on, if it reports them
+        if hasattr(policy, "scan_counter"):
+            policy.scan_counter = self
+            self.scans = self.scans or 0
+
+    def scanned(self, count: int):
+        self.scans += count
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.times[name] = self.times.get(name, 0.0) + time.perf_counter() - started
+
+    def placed(self, queued: bool, elapsed: float):
+        self.placements += 1
+        self.times["placement"] += elapsed
+        if queued:
+            self.pushed()
+
+    def pushed(self):
+        self.queue_pushes += 1
+        self.queue_depth += 1
+        if self.queue_depth > self.max_queue_depth:
+            self.max_queue_depth = self.queue_depth
+
+    def popped(self, count: int, elapsed: float, placed: bool = False):
+        self.queue_pops += count
+        self.queue_depth -= count
+        self.times["queue"] += elapsed
+        if placed:
+            self.placements += count
+
+    @contextlib.contextmanager
+    def profiling(self):
+        # Runs cProfile and the sampler over the block; nested blocks share
+        # the outermost one's
+        self.depth += 1
+        if self.depth == 1:
+            if self.profile is not None:
+                self.profile.enable()
+            if self.sample_interval:
+                self.sampling.clear()
+                self.sampler = threading.Thread(target=self._sample, args=(threading.get_ident(),), daemon=True)
+                self.sampler.start()
+        try:
+            yield
+        finally:
+            self.depth -= 1
+            if self.depth == 0:
+                if self.profile is not None:
+                    self.profile.disable()
+                if self.sampler is not None:
+                    self.sampling.set()
+                    self.sampler.join()
+                    self.sampler = None
+
+    def _sample(self, thread_id: int):
+        while not self.sampling.wait(self.sample_interval):
+            frame = sys._current_frames().get(thread_id)
+            # Once stopped, the profiled thread is only waiting for this one
+            if self.sampling.is_set():
+                break
+            if frame is not None:
+                code = frame.f_code
+                self.samples[f"{os.path.basename(code.co_filename)}:{code.co_name}"] += 1
+
+    def metrics(self, top: int = 10) -> Dict:
+        metrics = {f"{phase}_time": self.times[phase] for phase in self.times}
+        metrics["placements"] = self.placements
+        if self.scans is not None:
+            metrics["scans"] = self.scans
+            metrics["scans_per_placement"] = self.scans / self.placements if self.placements else 0.0
+        metrics.update({
+            "queue_pushes": self.queue_pushes,
+            "queue_pops": self.queue_pops,
+            "max_queue_depth": self.max_queue_depth,
+        })
+        if self.sample_interval:
+            total = sum(self.samples.values())
+            metrics["samples"] = {name: count / total for name, count in self.samples.most_common(top)}
+        return metrics
+
+    def print_stats(self, top: int = 20):
+        # The cProfile report, by cumulative time
+        if self.profile is not None:
+            import pstats
+
+            pstats.Stats(self.profile).sort_stats("cumulative").print_stats(top)
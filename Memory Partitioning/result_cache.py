@@ -0,0 +1,118 @@
+import collections
+import hashlib
+import json
+import os
+import struct
+import tempfile
+from typing import Dict, Iterable, Optional, Tuple
+
+# Cache of simulation results keyed by a fingerprint of everything a run
+# depends on: the workload, the partition layout (or memory size for dynamic
+# placement), the queue mode and the placement policy. Results are kept in an
+# in-memory LRU tier and, given a directory, in an on-disk tier of one JSON
+# file per result that is shared by all processes using the directory.
+
+# Bump whenever a change to the simulator alters the results of a run, so that
+# results cached by the old code are no longer found.
+SIMULATOR_VERSION = 4
+
+_WORKLOAD_ITEM = struct.Struct("<qd")
+_LAYOUT_ITEM = struct.Struct("<qq")
+
+
+def fingerprint(workload: Iterable[Tuple[int, float]], layout: Iterable[Tuple[int, int]], memory_size: int,
+                queue_mode: str, placement: str) -> str:
+    # workload holds (size, time_needed) per process in arrival order, layout
+    # (partition_id, size) per partition. Floats are hashed by their exact bits.
+    digest = hashlib.sha256()
+    digest.update(f"v{SIMULATOR_VERSION}|{queue_mode}|{placement}|{memory_size}|".encode())
+    for size, time_needed in workload:
+        digest.update(_WORKLOAD_ITEM.pack(size, time_needed))
+    digest.update(b"|")
+    for partition_id, size in layout:
+        digest.update(_LAYOUT_ITEM.pack(partition_id, size))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, directory: Optional[str] = None, memory_entries: int = 4096, max_disk_bytes: int = 256 << 20):
+        self.memory: "collections.OrderedDict[str, Dict]" = collections.OrderedDict()
+        self.memory_entries = memory_entries
+        self.directory = os.path.join(directory, f"v{SIMULATOR_VERSION}") if directory else None
+        self.max_disk_bytes = max_disk_bytes
+        self.disk_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            self.disk_bytes = sum(size for _, _, size in self._disk_entries())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _disk_entries(self):
+        # (last use, path, size) of every file in the disk tier
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                yield stat.st_mtime, entry.path, stat.st_size
+
+    def _remember(self, key: str, result: Dict):
+        self.memory[key] = result
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Dict]:
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            self.hits += 1
+            return self.memory[key]
+        if self.directory:
+            path = self._path(key)
+            try:
+                with open(path) as file:
+                    result = json.load(file)
+                # The modification time doubles as the last use for eviction
+                os.utime(path)
+            except (FileNotFoundError, json.JSONDecodeError):
+                pass
+            else:
+                self._remember(key, result)
+                self.hits += 1
+                return result
+        self.misses += 1
+        return None
+
+    def put(self, key: str, result: Dict):
+        self._remember(key, result)
+        if not self.directory:
+            return
+        # Written to a temporary file and renamed, so concurrent readers never
+        # see a partial result
+        data = json.dumps(result).encode()
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(data)
+        os.replace(temporary, self._path(key))
+        self.disk_bytes += len(data)
+        if self.disk_bytes > self.max_disk_bytes:
+            self._evict()
+
+    def _evict(self):
+        # Removes the least recently used files until the tier is down to 90%
+        # of its limit, so eviction does not run again on the next put
+        entries = sorted(self._disk_entries())
+        self.disk_bytes = sum(size for _, _, size in entries)
+        target = self.max_disk_bytes * 0.9
+        for _, path, size in entries:
+            if self.disk_bytes <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self.disk_bytes -= size
@@ -0,0 +1,183 @@
+import argparse
+import functools
+import heapq
+import operator
+import random
+from collections import deque
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Scheduling disciplines for partition waiting queues. A discipline decides
+# which waiting process a freed partition takes next and, with a quantum, how
+# long a process may run before it is preempted and queued again:
+#
+#   fifo         arrival order, run to completion (the default)
+#   sjf          shortest time_needed first, run to completion
+#   priority     lowest priority class first (FIFO within a class), run to completion
+#   round-robin  arrival order, preempted after every quantum while others wait
+#
+# The sjf and priority queues are binary heaps with O(log n) appends and pops,
+# behind the deque methods the simulator uses. Simulation(..., disciplines=...)
+# takes one discipline for every partition, or a dict of them by partition_id.
+# sjf and priority order the per-partition queues of multi-queue mode; a
+# single queue keeps its own order and only takes round-robin. A preempted
+# process goes back to its own round-robin queue, so the processes in an sjf
+# queue have not run yet and their time_needed is what they have left.
+
+
+# Waiting queue ordered by key(process), lowest first. Keys must be picklable
+# (no lambdas), as checkpoints store the queues.
+class HeapQueue:
+    def __init__(self, key: Callable[["Process"], float]):
+        self.heap: List[Tuple] = []
+        self.key = key
+        # Breaks ties in arrival order
+        self.sequence = 0
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def __iter__(self) -> Iterator["Process"]:
+        # In the order the processes would be taken
+        for entry in sorted(self.heap):
+            yield entry[-1]
+
+    def append(self, process: "Process"):
+        self.sequence += 1
+        heapq.heappush(self.heap, (self.key(process), self.sequence, process))
+
+    def popleft(self) -> "Process":
+        return heapq.heappop(self.heap)[-1]
+
+
+# key orders the waiting queue, or is None for arrival order
+class Discipline:
+    def __init__(self, name: str, key: Optional[Callable[["Process"], float]] = None, quantum: Optional[float] = None):
+        if quantum is not None and quantum <= 0:
+            raise ValueError("Quantum must be positive")
+        self.name = name
+        self.key = key
+        self.quantum = quantum
+
+    def queue(self):
+        # A fresh waiting queue for one partition
+        if self.key is None:
+            return deque()
+        return HeapQueue(self.key)
+
+    def __repr__(self) -> str:
+        return self.name if self.quantum is None else f"{self.name}:{self.quantum:g}"
+
+
+def fifo() -> Discipline:
+    return Discipline("fifo")
+
+
+def _priority_class(priorities: Dict[int, int], process: "Process") -> int:
+    return priorities.get(process.process_id, 0)
+
+
+def shortest_job_first() -> Discipline:
+    return Discipline("sjf", operator.attrgetter("time_needed"))
+
+
+def priority(priorities: Optional[Dict[int, int]] = None) -> Discipline:
+    # priorities maps process_id to a priority class; processes not in it are
+    # class 0
+    return Discipline("priority", functools.partial(_priority_class, priorities or {}))
+
+
+def round_robin(quantum: float = 2.0) -> Discipline:
+    return Discipline("round-robin", quantum=quantum)
+
+
+DISCIPLINES = {
+    "fifo": fifo,
+    "sjf": shortest_job_first,
+    "priority": priority,
+    "round-robin": round_robin,
+}
+
+
+def parse_discipline(spec: str, priorities: Optional[Dict[int, int]] = None) -> Discipline:
+    # "name" or "round-robin:QUANTUM"; priorities are the classes for the
+    # priority discipline
+    name, _, quantum = spec.partition(":")
+    if name not in DISCIPLINES:
+        raise ValueError(f"Unknown discipline {name!r}; expected one of {', '.join(DISCIPLINES)}")
+    if quantum:
+        if name != "round-robin":
+            raise ValueError(f"Only round-robin takes a quantum, not {name!r}")
+        return round_robin(float(quantum))
+    if name == "priority":
+        return priority(priorities)
+    return DISCIPLINES[name]()
+
+
+def assign_priorities(processes: Iterable["Process"], classes: int, rng=random) -> Dict[int, int]:
+    # Uniform random priority classes 0 (most urgent) to classes - 1, by
+    # process_id
+    return {process.process_id: rng.randrange(classes) for process in processes}
+
+
+def wait_summary(processes: Iterable["Process"]) -> Dict[str, float]:
+    # Mean and tail of the total wait of every finished process, preempted
+    # waits included
+    from latency import percentile
+
+    waits = sorted(process.waiting_time for process in processes if process.finish_time is not None)
+    return {
+        "finished": len(waits),
+        "mean_wait": sum(waits) / len(waits) if waits else 0.0,
+        "p50_wait": percentile(waits, 50),
+        "p95_wait": percentile(waits, 95),
+        "p99_wait": percentile(waits, 99),
+    }
+
+
+def main():
+    from MainProgram import Simulation, generate_random_partitions, generate_random_processes
+
+    parser = argparse.ArgumentParser(description="Compare partition queue scheduling disciplines on one workload")
+    parser.add_argument("--memory-size", type=int, required=True, help="memory size (MB)")
+    parser.add_argument("--partition-count", type=int, default=10, help="number of random fixed partitions")
+    parser.add_argument("--processes", type=int, default=1000, help="number of random processes")
+    parser.add_argument("--disciplines", nargs="+", default=["fifo", "sjf", "priority", "round-robin:2"],
+                        help="disciplines to compare: fifo, sjf, priority or round-robin[:QUANTUM]")
+    parser.add_argument("--priority-classes", type=int, default=3, help="random priority classes of the processes")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the workload and partition layout")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    workload = generate_random_processes(args.processes, rng)
+    priorities = assign_priorities(workload, args.priority_classes, rng)
+    try:
+        disciplines = [parse_discipline(spec, priorities) for spec in args.disciplines]
+    except ValueError as error:
+        parser.error(str(error))
+    layout, _ = generate_random_partitions(args.partition_count, args.memory_size, rng)
+
+    # Multi-queue mode, where every partition schedules its own queue
+    print(f"{'Discipline':<18}{'Finished':>10}{'Mean wait':>11}{'p50':>10}{'p95':>10}{'p99':>10}"
+          f"{'Response':>10}{'Preemptions':>13}{'Running time':>14}")
+    class_waits = []
+    for discipline in disciplines:
+        processes = [process.copy() for process in workload]
+        simulation = Simulation([partition.copy() for partition in layout], disciplines=discipline)
+        simulation.allocate(processes)
+        _, running_time, _ = simulation.simulate_execution(verbose=False)
+        summary = wait_summary(processes)
+        response = sum(simulation.waiting_times) / len(simulation.waiting_times) if simulation.waiting_times else 0.0
+        print(f"{discipline!r:<18}{summary['finished']:>10}{summary['mean_wait']:>11.2f}{summary['p50_wait']:>10.2f}"
+              f"{summary['p95_wait']:>10.2f}{summary['p99_wait']:>10.2f}{response:>10.2f}"
+              f"{simulation.preemptions:>13}{running_time:>14.2f}")
+        class_waits.append([wait_summary(process for process in processes if priorities[process.process_id] == priority_class)["mean_wait"]
+                            for priority_class in range(args.priority_classes)])
+
+    print("\nMean wait per priority class")
+    print(f"{'Discipline':<18}" + "".join(f"{f'Class {priority_class}':>10}" for priority_class in range(args.priority_classes)))
+    for discipline, waits in zip(disciplines, class_waits):
+        print(f"{discipline!r:<18}" + "".join(f"{wait:>10.2f}" for wait in waits))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import random
+from typing import Dict, List
+
+# Backing store behind the partitions. With a swap tier attached, a process
+# larger than every partition is admitted with only the largest partition's
+# worth of memory resident (Process.resident_size) and the rest
+# (Process.swapped_size) in swap, while Process.size keeps the size it asked
+# for. Such a process pages its swapped part in before it runs and out when it
+# finishes, each transfer costing latency + size / bandwidth seconds, which
+# lengthens its run. The tier counts the traffic and time it causes, and the
+# module's command line compares throughput across memory sizes and swap
+# bandwidths:
+#
+#   python swap.py --memory-sizes 200 400 800 --bandwidths 50 200
+
+
+class SwapTier:
+    def __init__(self, bandwidth: float, latency: float = 0.0):
+        if bandwidth <= 0:
+            raise ValueError("Swap bandwidth must be positive")
+        self.bandwidth = bandwidth  # MB per second
+        self.latency = latency  # seconds per transfer
+        self.traffic = 0.0
+        self.transfers = 0
+        self.swap_time = 0.0
+        self.swapped_processes = 0
+
+    def transfer(self, size: float) -> float:
+        # Moves size MB between memory and swap and returns how long it takes
+        duration = self.latency + size / self.bandwidth
+        self.traffic += size
+        self.transfers += 1
+        self.swap_time += duration
+        return duration
+
+    def admit(self):
+        # A process admitted with part of it kept in swap
+        self.swapped_processes += 1
+
+    def page(self, size: float) -> float:
+        # A run with size MB in swap: paged in before it starts, out after it
+        # ends. A preempted process pages once per run.
+        return self.transfer(size) + self.transfer(size)
+
+    def report(self, running_time: float) -> Dict[str, float]:
+        return {
+            "swapped_processes": self.swapped_processes,
+            "swap_traffic": self.traffic,
+            "swap_transfers": self.transfers,
+            "swap_time": self.swap_time,
+            "swap_bandwidth_used": self.traffic / running_time if running_time else 0.0,
+        }
+
+
+def main():
+    import argparse
+
+    from MainProgram import Simulation, generate_random_partitions, generate_random_processes
+    from partition_index import PLACEMENT_POLICIES
+    from sweep import QUEUE_MODES
+
+    parser = argparse.ArgumentParser(description="Measure how swap traffic affects throughput across memory and swap sizes")
+    parser.add_argument("--memory-sizes", type=int, nargs="+", required=True, help="memory sizes (MB)")
+    parser.add_argument("--bandwidths", type=float, nargs="+", required=True, help="swap bandwidths (MB/s)")
+    parser.add_argument("--latency", type=float, default=0.01, help="swap latency per transfer (seconds)")
+    parser.add_argument("--partition-count", type=int, default=10, help="number of random fixed partitions")
+    parser.add_argument("--processes", type=int, default=1000, help="number of random processes")
+    parser.add_argument("--queue-mode", choices=list(QUEUE_MODES), default="single-largest", help="queue strategy")
+    parser.add_argument("--placement", choices=list(PLACEMENT_POLICIES), default="best", help="placement policy")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the workload and partition layouts")
+    args = parser.parse_args()
+
+    print(f"{'Memory':>8}{'Bandwidth':>11}{'Completed':>11}{'Throughput':>12}{'Mean wait':>11}"
+          f"{'Swapped':>9}{'Traffic (MB)':>14}{'Swap time':>11}")
+    for memory_size in args.memory_sizes:
+        rng = random.Random(args.seed)
+        workload = generate_random_processes(args.processes, rng)
+        layout, _ = generate_random_partitions(args.partition_count, memory_size, rng)
+        configurations: List = [None] + [SwapTier(bandwidth, args.latency) for bandwidth in args.bandwidths]
+        for swap in configurations:
+            simulation = Simulation([partition.copy() for partition in layout], QUEUE_MODES[args.queue_mode](),
+                                    PLACEMENT_POLICIES[args.placement], swap=swap)
+            simulation.allocate([process.copy() for process in workload])
+            _, running_time, waiting_time = simulation.simulate_execution(verbose=False)
+            throughput = simulation.completed / running_time if running_time else 0.0
+            mean_wait = waiting_time / simulation.completed if simulation.completed else 0.0
+            report = swap.report(running_time) if swap else {"swapped_processes": 0, "swap_traffic": 0.0, "swap_time": 0.0}
+            bandwidth = f"{swap.bandwidth:g}" if swap else "no swap"
+            print(f"{memory_size:>8}{bandwidth:>11}{simulation.completed:>11}{throughput:>12.4f}{mean_wait:>11.2f}"
+                  f"{report['swapped_processes']:>9}{report['swap_traffic']:>14.0f}{report['swap_time']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+import argparse
+import collections
+import csv
+import itertools
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from dynamic_memory import mean_fragmentation
+from partition_index import PLACEMENT_POLICIES
+from result_cache import ResultCache, fingerprint
+from MainProgram import (
+    FittingSingleQueue,
+    MultiQueue,
+    Process,
+    Simulation,
+    SingleQueue,
+    buddy_placement,
+    calculate_time_utilization,
+    generate_random_partitions,
+    variable_placement,
+    generate_random_processes,
+)
+
+COLUMNS = [
+    "memory_size", "partition_count", "process_count", "seed", "queue_mode", "placement",
+    "partition_total", "used_size", "execution_time", "running_time", "waiting_time", "utilization",
+    "completed", "throughput", "mean_waiting_time", "mean_external_fragmentation",
+]
+
+QUEUE_MODES = {
+    "multi": MultiQueue,
+    "single": SingleQueue,
+    "single-largest": lambda: FittingSingleQueue("largest"),
+    "single-oldest": lambda: FittingSingleQueue("oldest"),
+}
+
+PLACEMENTS = list(PLACEMENT_POLICIES) + ["buddy", "variable"]
+DYNAMIC_PLACEMENTS = {"buddy": buddy_placement, "variable": variable_placement}
+
+Task = Tuple[int, int, int, int]
+
+# One result cache per worker process and cache directory
+_caches: Dict[Tuple[str, int], ResultCache] = {}
+
+
+def get_cache(directory: str, max_disk_bytes: int) -> ResultCache:
+    key = (directory, max_disk_bytes)
+    if key not in _caches:
+        _caches[key] = ResultCache(directory, max_disk_bytes=max_disk_bytes)
+    return _caches[key]
+
+
+def run_configuration(memory_size: int, partition_count: int, process_count: int, seed: int,
+                      queue_modes: Iterable[str] = ("multi", "single"), placements: Iterable[str] = ("best",),
+                      cache: Optional[ResultCache] = None) -> List[Dict]:
+    # Every task draws from its own RNG seeded by the task itself, so results do
+    # not depend on which worker runs it or how many workers there are.
+    rng = random.Random(seed)
+    workload = [(process.size, process.time_needed) for process in generate_random_processes(process_count, rng)]
+    layout, partition_total = generate_random_partitions(partition_count, memory_size, rng)
+
+    rows = []
+    for queue_mode, placement in itertools.product(queue_modes, placements):
+        dynamic = placement in DYNAMIC_PLACEMENTS
+        # Dynamic policies carve their own partitions out of memory_size, and
+        # those only exist while running, so they need a single queue
+        if dynamic and queue_mode == "multi":
+            continue
+
+        row = {
+            "memory_size": memory_size,
+            "partition_count": partition_count,
+            "process_count": process_count,
+            "seed": seed,
+            "queue_mode": queue_mode,
+            "placement": placement,
+            "partition_total": partition_total,
+        }
+        if cache is not None:
+            # Fixed layouts do not depend on the memory size, dynamic placement
+            # only on the memory size
+            key = fingerprint(workload, () if dynamic else [(partition.partition_id, partition.size) for partition in layout],
+                              memory_size if dynamic else 0, queue_mode, placement)
+            result = cache.get(key)
+            if result is not None:
+                row.update(result)
+                rows.append(row)
+                continue
+
+        if dynamic:
+            simulation = Simulation([], QUEUE_MODES[queue_mode](), DYNAMIC_PLACEMENTS[placement](memory_size))
+        else:
+            simulation = Simulation([partition.copy() for partition in layout], QUEUE_MODES[queue_mode](),
+                                    PLACEMENT_POLICIES[placement])
+
+        processes = [Process(size, i + 1, time_needed) for i, (size, time_needed) in enumerate(workload)]
+        simulation.allocate(processes)
+        used_size = sum(partition.currently_occupied for partition in simulation.partitions)
+        total_execution_time, total_running_time, total_waiting_time = simulation.simulate_execution(verbose=False)
+
+        result = {
+            "used_size": used_size,
+            "execution_time": total_execution_time,
+            "running_time": total_running_time,
+            "waiting_time": total_waiting_time,
+            "utilization": calculate_time_utilization(total_execution_time, total_running_time, simulation.concurrency()),
+            "completed": simulation.completed,
+            "throughput": simulation.completed / total_running_time if total_running_time else 0.0,
+            "mean_waiting_time": total_waiting_time / simulation.completed if simulation.completed else 0.0,
+            "mean_external_fragmentation": mean_fragmentation(simulation.fragmentation, total_running_time),
+        }
+        if cache is not None:
+            cache.put(key, result)
+        row.update(result)
+        rows.append(row)
+    return rows
+
+
+def run_chunk(tasks: List[Task], queue_modes: Iterable[str] = ("multi", "single"),
+              placements: Iterable[str] = ("best",), cache_dir: Optional[str] = None,
+              cache_bytes: int = 256 << 20) -> List[Dict]:
+    cache = get_cache(cache_dir, cache_bytes) if cache_dir else None
+    rows = []
+    for task in tasks:
+        rows.extend(run_configuration(*task, queue_modes=queue_modes, placements=placements, cache=cache))
+    return rows
+
+
+def sweep_tasks(memory_sizes: Iterable[int], partition_counts: Iterable[int], process_counts: Iterable[int], seeds: Iterable[int]) -> Iterator[Task]:
+    for memory_size, partition_count, process_count, seed in itertools.product(memory_sizes, partition_counts, process_counts, seeds):
+        # generate_random_partitions needs at least 10MB per partition
+        if memory_size >= 10 * partition_count:
+            yield memory_size, partition_count, process_count, seed
+
+
+# With a cache_dir, results are cached on disk there and shared between workers
+# and runs, so a repeated or resumed sweep only simulates what is missing.
+def run_sweep(tasks: Iterable[Task], workers: Optional[int] = None, chunk_size: int = 64,
+              queue_modes: Iterable[str] = ("multi", "single"), placements: Iterable[str] = ("best",),
+              cache_dir: Optional[str] = None, cache_bytes: int = 256 << 20) -> Iterator[Dict]:
+    queue_modes = tuple(queue_modes)
+    placements = tuple(placements)
+    tasks = iter(tasks)
+    chunks = iter(lambda: list(itertools.islice(tasks, chunk_size)), [])
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for chunk in chunks:
+            yield from run_chunk(chunk, queue_modes, placements, cache_dir, cache_bytes)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Keep a bounded number of chunks in flight so huge sweeps are never
+        # materialized as futures all at once. Results are yielded oldest
+        # chunk first, so the output is in task order whatever the number of
+        # workers.
+        max_pending = 2 * workers
+        pending = collections.deque()
+        for chunk in chunks:
+            pending.append(executor.submit(run_chunk, chunk, queue_modes, placements, cache_dir, cache_bytes))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def write_results(rows: Iterable[Dict], path: str, batch_size: int = 10000) -> int:
+    # Parquet output needs pyarrow; anything else is written as CSV
+    rows = iter(rows)
+    count = 0
+    if path.endswith(".parquet"):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        for batch in iter(lambda: list(itertools.islice(rows, batch_size)), []):
+            table = pa.Table.from_pylist(batch)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+            count += len(batch)
+        if writer is not None:
+            writer.close()
+        return count
+
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=COLUMNS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+class Summary:
+    # Running means per queue mode and placement, collected while rows stream past
+    def __init__(self):
+        self.totals: Dict[str, List[float]] = {}
+
+    def track(self, rows: Iterable[Dict]) -> Iterator[Dict]:
+        for row in rows:
+            totals = self.totals.setdefault(f"{row['queue_mode']}/{row['placement']}", [0, 0.0, 0.0])
+            totals[0] += 1
+            totals[1] += row["throughput"]
+            totals[2] += row["mean_waiting_time"]
+            yield row
+
+    def print(self, baseline: str = "single/best"):
+        print(f"{'Mode':<24}{'Throughput':>14}{'Mean wait':>14}{'vs ' + baseline:>24}")
+        means = {mode: (throughput / runs, waiting / runs) for mode, (runs, throughput, waiting) in self.totals.items()}
+        for mode, (throughput, waiting) in means.items():
+            comparison = ""
+            if baseline in means and mode != baseline:
+                base_throughput, base_waiting = means[baseline]
+                comparison = (f"{(throughput / base_throughput - 1) * 100 if base_throughput else 0:+.1f}% / "
+                              f"{(waiting / base_waiting - 1) * 100 if base_waiting else 0:+.1f}%")
+            print(f"{mode:<24}{throughput:>14.4f}{waiting:>14.2f}{comparison:>24}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a parameter sweep of memory partitioning simulations")
+    parser.add_argument("--memory-sizes", type=int, nargs="+", required=True, help="memory sizes (MB)")
+    parser.add_argument("--partition-counts", type=int, nargs="+", required=True, help="partition counts")
+    parser.add_argument("--process-counts", type=int, nargs="+", required=True, help="process counts")
+    parser.add_argument("--seeds", type=int, default=10, help="number of seeds per configuration, starting at --first-seed")
+    parser.add_argument("--first-seed", type=int, default=0, help="first seed of the range")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=64, help="configurations per submitted task")
+    parser.add_argument("--queue-modes", nargs="+", choices=list(QUEUE_MODES), default=["multi", "single"],
+                        help="queue strategies to simulate for every configuration")
+    parser.add_argument("--placements", nargs="+", choices=PLACEMENTS, default=["best"],
+                        help="placement policies to simulate for every configuration")
+    parser.add_argument("--cache-dir", default=None,
+                        help="directory of cached results, reused by later sweeps with the same configurations")
+    parser.add_argument("--cache-size", type=int, default=256, help="size limit of the on-disk cache (MB)")
+    parser.add_argument("--output", default="sweep_results.csv", help="output file (.csv or .parquet)")
+    parser.add_argument("--summary", action="store_true",
+                        help="print mean throughput and waiting time per queue mode and placement, "
+                             "relative to the FIFO single queue with best fit")
+    args = parser.parse_args()
+
+    tasks = sweep_tasks(args.memory_sizes, args.partition_counts, args.process_counts,
+                        range(args.first_seed, args.first_seed + args.seeds))
+    summary = Summary()
+    rows = summary.track(run_sweep(tasks, args.workers, args.chunk_size, args.queue_modes, args.placements,
+                                   args.cache_dir, args.cache_size << 20))
+    count = write_results(rows, args.output)
+    print(f"Wrote {count} results to {args.output}")
+    if args.summary:
+        summary.print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import argparse
+import csv
+import io
+import itertools
+import json
+import mmap
+import random
+import struct
+from typing import Iterable, Iterator
+
+from checkpoint import Checkpointer, resume
+from MainProgram import Process, Simulation, calculate_time_utilization, generate_random_partitions
+from partition_index import PLACEMENT_POLICIES
+from sweep import DYNAMIC_PLACEMENTS, PLACEMENTS, QUEUE_MODES
+
+# Workload traces hold one job per row with the fields arrival_time, size (MB)
+# and duration (seconds), plus an optional process_id. Readers are generators
+# that yield Process objects one at a time, so a trace of any length can be
+# fed to Simulation.simulate_execution(arrivals=...) without loading it.
+
+# Binary traces are a flat array of little-endian (process_id, arrival_time,
+# size, duration) records, read through mmap without parsing or copying the file.
+BINARY_RECORD = struct.Struct("<qdqd")
+
+
+def _make_process(index: int, arrival_time, size, duration, process_id=None) -> Process:
+    return Process(int(size), int(process_id) if process_id not in (None, "") else index + 1,
+                   float(duration), float(arrival_time))
+
+
+def read_csv_trace(path: str, chunk_size: int = 1 << 20) -> Iterator[Process]:
+    with open(path, newline="", buffering=chunk_size) as file:
+        for index, row in enumerate(csv.DictReader(file)):
+            yield _make_process(index, row["arrival_time"], row["size"], row["duration"], row.get("process_id"))
+
+
+def read_jsonl_trace(path: str, chunk_size: int = 1 << 20) -> Iterator[Process]:
+    with open(path, buffering=chunk_size) as file:
+        index = 0
+        # Reads whole batches of lines at once instead of one line per call
+        for lines in iter(lambda: file.readlines(chunk_size), []):
+            for line in lines:
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                yield _make_process(index, row["arrival_time"], row["size"], row["duration"], row.get("process_id"))
+                index += 1
+
+
+def read_binary_trace(path: str, chunk_records: int = 1 << 16) -> Iterator[Process]:
+    with open(path, "rb") as file:
+        if file.seek(0, io.SEEK_END) == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            if len(view) % BINARY_RECORD.size:
+                raise ValueError(f"{path} is not a whole number of {BINARY_RECORD.size}-byte records")
+            chunk_bytes = chunk_records * BINARY_RECORD.size
+            try:
+                for offset in range(0, len(view), chunk_bytes):
+                    for process_id, arrival_time, size, duration in BINARY_RECORD.iter_unpack(view[offset:offset + chunk_bytes]):
+                        yield Process(size, process_id, duration, arrival_time)
+            finally:
+                view.release()
+
+
+def write_binary_trace(processes: Iterable[Process], path: str, chunk_records: int = 1 << 16) -> int:
+    count = 0
+    processes = iter(processes)
+    with open(path, "wb") as file:
+        for chunk in iter(lambda: list(itertools.islice(processes, chunk_records)), []):
+            file.write(b"".join(BINARY_RECORD.pack(process.process_id, process.arrival_time, process.size, process.time_needed)
+                                for process in chunk))
+            count += len(chunk)
+    return count
+
+
+def read_trace(path: str) -> Iterator[Process]:
+    if path.endswith(".csv"):
+        return read_csv_trace(path)
+    if path.endswith((".jsonl", ".json")):
+        return read_jsonl_trace(path)
+    if path.endswith(".bin"):
+        return read_binary_trace(path)
+    raise ValueError(f"Unknown trace format for {path}; expected .csv, .jsonl or .bin")
+
+
+# checkpoint, if given, is a checkpoint.Checkpointer that snapshots the replay
+def run_trace(path: str, memory_size: int, partition_count: int, queue_mode: str = "single",
+              placement: str = "best", seed=None, verbose=False, checkpoint=None):
+    if placement in DYNAMIC_PLACEMENTS:
+        simulation = Simulation([], QUEUE_MODES[queue_mode](), DYNAMIC_PLACEMENTS[placement](memory_size))
+    else:
+        partitions, _ = generate_random_partitions(partition_count, memory_size, random.Random(seed))
+        simulation = Simulation(partitions, QUEUE_MODES[queue_mode](), PLACEMENT_POLICIES[placement])
+    totals = simulation.simulate_execution(verbose=verbose, arrivals=read_trace(path), checkpoint=checkpoint)
+    return simulation, totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay or convert workload traces")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="simulate a trace, admitting jobs as they arrive")
+    run.add_argument("trace", help="trace file (.csv, .jsonl or .bin)")
+    run.add_argument("--memory-size", type=int, required=True, help="memory size (MB)")
+    run.add_argument("--partition-count", type=int, default=10, help="number of random fixed partitions")
+    run.add_argument("--seed", type=int, default=None, help="seed for the random partition layout")
+    run.add_argument("--queue-mode", choices=list(QUEUE_MODES), default="single", help="queue strategy")
+    run.add_argument("--placement", choices=PLACEMENTS, default="best", help="placement policy")
+    run.add_argument("--verbose", action="store_true", help="print every executed process")
+    run.add_argument("--checkpoint", default=None, help="snapshot the replay to this file as it runs")
+    run.add_argument("--checkpoint-interval", type=float, default=60.0, help="seconds between snapshots")
+    run.add_argument("--resume", action="store_true",
+                     help="continue the replay from the --checkpoint file instead of starting over; "
+                          "the layout and policies come from the checkpoint")
+
+    convert = commands.add_parser("convert", help="convert a trace to the binary trace format")
+    convert.add_argument("trace", help="input trace (.csv, .jsonl or .bin)")
+    convert.add_argument("output", help="output binary trace (.bin)")
+    args = parser.parse_args()
+
+    if args.command == "convert":
+        count = write_binary_trace(read_trace(args.trace), args.output)
+        print(f"Wrote {count} records to {args.output}")
+        return
+
+    # Dynamic policies create partitions on demand, which multi-queue mode
+    # cannot queue on; a resumed replay takes its policies from the checkpoint
+    if not args.resume and args.queue_mode == "multi" and args.placement in DYNAMIC_PLACEMENTS:
+        run.error(f"--placement {args.placement} needs a single queue, not --queue-mode multi")
+    checkpoint = Checkpointer(args.checkpoint, args.checkpoint_interval) if args.checkpoint else None
+    if args.resume:
+        if checkpoint is None:
+            parser.error("--resume needs --checkpoint")
+        simulation, (total_execution_time, total_running_time, total_waiting_time) = resume(
+            args.checkpoint, read_trace(args.trace), args.verbose, checkpoint)
+    else:
+        simulation, (total_execution_time, total_running_time, total_waiting_time) = run_trace(
+            args.trace, args.memory_size, args.partition_count, args.queue_mode, args.placement, args.seed,
+            args.verbose, checkpoint)
+    print(f"Completed Processes: {simulation.completed}")
+    print(f"Total Time Needed for Processes: {total_execution_time:.2f} seconds")
+    print(f"Total Running Time of Application: {total_running_time:.2f} seconds")
+    print(f"Total Waiting Time: {total_waiting_time:.2f} seconds")
+    print(f"Time Utilization: {calculate_time_utilization(total_execution_time, total_running_time, simulation.concurrency()):.2f}%")
+
+
+if __name__ == "__main__":
+    main()
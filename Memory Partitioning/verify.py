@@ -0,0 +1,223 @@
+import math
+import random
+import sys
+from typing import List, Optional, Tuple
+
+from event_log import DEBUG, EventLog
+from MainProgram import (
+    FittingSingleQueue,
+    MultiQueue,
+    Simulation,
+    SingleQueue,
+    generate_poisson_arrivals,
+    generate_random_partitions,
+    generate_random_processes,
+)
+from partition_index import LinearPartitionIndex, PartitionIndex
+
+# Consistency checks of the simulator against reference implementations, over
+# seeded workloads in every queue mode, both as one batch at time 0 and as
+# Poisson arrivals:
+#
+#   placement  best fit through PartitionIndex starts and finishes every
+#              process in the same partition at the same time as the linear
+#              scan of LinearPartitionIndex
+#   waiting    the waiting times and totals match a replay of the event log,
+#              where each start event waits from its process's arrival
+#   dispatch   FittingSingleQueue with largest-first dispatch and aging
+#              starts the same processes at the same times as a linear scan
+#              of the waiting queue for the process its rule picks
+#   batch      batch.batch_simulate assigns every process of a batch to the
+#              same partition, with the same start time and totals, as the
+#              multi-queue simulation (needs NumPy)
+#
+#   python verify.py --seeds 50
+
+QUEUE_MODES = {
+    "multi": MultiQueue,
+    "single": SingleQueue,
+    "single-largest": lambda: FittingSingleQueue("largest"),
+}
+
+
+# Keeps every event in memory instead of writing it out
+class RecordingLog(EventLog):
+    def __init__(self, level: int = DEBUG):
+        self.level = level
+        self.events: List[List] = []
+
+    def write(self, event: List):
+        self.events.append(event)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def workload(seed: int, process_count: int, online: bool):
+    rng = random.Random(seed)
+    if online:
+        processes = list(generate_poisson_arrivals(process_count, 1.0, rng))
+    else:
+        processes = generate_random_processes(process_count, rng)
+    partitions, _ = generate_random_partitions(rng.randint(1, 12), rng.randint(150, 600), rng)
+    return processes, partitions
+
+
+# Reference for FittingSingleQueue: its dispatch rule applied to a plain list
+class LinearFittingQueue(SingleQueue):
+    def __init__(self, dispatch="largest", aging_threshold: Optional[float] = 30.0):
+        self.waiting_processes = []
+        self.dispatch = dispatch
+        self.aging_threshold = aging_threshold
+
+    def next_process(self, partition) -> Optional["Process"]:
+        return self.next_fitting(partition.size)
+
+    def next_fitting(self, capacity: int) -> Optional["Process"]:
+        fitting = [process for process in self.waiting_processes if process.resident_size <= capacity]
+        if not fitting:
+            return None
+        aged = [process for process in fitting
+                if self.aging_threshold is not None and self.clock - process.enqueue_time >= self.aging_threshold]
+        if self.dispatch == "oldest":
+            chosen = fitting[0]
+        elif aged:
+            # The process that has waited longest among those that fit
+            chosen = aged[0]
+        else:
+            # The largest that fits, oldest first among equal sizes
+            chosen = max(fitting, key=lambda process: process.resident_size)
+        self.waiting_processes.remove(chosen)
+        return chosen
+
+
+def run(processes, partitions, queue_mode: str, placement=PartitionIndex, online: bool = False, queue=None):
+    # The totals and the event log of one run on copies of the workload, with
+    # the queue strategy of queue_mode unless a queue is given
+    log = RecordingLog()
+    if queue is None:
+        queue = QUEUE_MODES[queue_mode]()
+    simulation = Simulation([partition.copy() for partition in partitions], queue, placement, event_log=log)
+    processes = [process.copy() for process in processes]
+    if online:
+        totals = simulation.simulate_execution(verbose=False, arrivals=processes)
+    else:
+        simulation.allocate(processes)
+        totals = simulation.simulate_execution(verbose=False)
+    return simulation, processes, totals, log.events
+
+
+def check_placement(processes, partitions, queue_mode: str, online: bool) -> Optional[str]:
+    _, _, totals, events = run(processes, partitions, queue_mode, PartitionIndex, online)
+    _, _, expected_totals, expected_events = run(processes, partitions, queue_mode, LinearPartitionIndex, online)
+    for event, expected in zip(events, expected_events):
+        if event != expected:
+            return f"{event} where the linear scan has {expected}"
+    if len(events) != len(expected_events) or totals != expected_totals:
+        return f"totals {totals} where the linear scan has {expected_totals}"
+    return None
+
+
+def check_waiting(processes, partitions, queue_mode: str, online: bool) -> Optional[str]:
+    simulation, run_processes, (_, _, total_waiting_time), events = run(processes, partitions, queue_mode, online=online)
+    # Every process is admitted at its arrival and runs once
+    arrivals = {process.process_id: process.arrival_time for process in processes}
+    waits = {event[2]: event[1] - arrivals[event[2]] for event in events if event[0] == "start"}
+    if list(simulation.waiting_times) != list(waits.values()):
+        return f"waiting times {list(simulation.waiting_times)} where the log has {list(waits.values())}"
+    for process in run_processes:
+        if process.waiting_time != waits.get(process.process_id, 0.0):
+            return f"P{process.process_id} waited {process.waiting_time} where the log has {waits.get(process.process_id)}"
+    if not math.isclose(total_waiting_time, math.fsum(waits.values()), rel_tol=1e-9, abs_tol=1e-9):
+        return f"total waiting time {total_waiting_time} where the log has {math.fsum(waits.values())}"
+    return None
+
+
+def check_dispatch(processes, partitions, queue_mode: str, online: bool) -> Optional[str]:
+    for aging_threshold in (None, 5.0, 30.0):
+        _, _, totals, events = run(processes, partitions, queue_mode, online=online,
+                                   queue=FittingSingleQueue("largest", aging_threshold))
+        _, _, expected_totals, expected_events = run(processes, partitions, queue_mode, online=online,
+                                                     queue=LinearFittingQueue("largest", aging_threshold))
+        for event, expected in zip(events, expected_events):
+            if event != expected:
+                return f"{event} where the linear scan has {expected} (aging threshold {aging_threshold})"
+        if len(events) != len(expected_events) or totals != expected_totals:
+            return f"totals {totals} where the linear scan has {expected_totals} (aging threshold {aging_threshold})"
+    return None
+
+
+def check_batch(processes, partitions, queue_mode: str, online: bool) -> Optional[str]:
+    from batch import batch_simulate, partitions_to_arrays, processes_to_arrays
+
+    _, run_processes, totals, events = run(processes, partitions, queue_mode)
+    sizes, times_needed, _ = processes_to_arrays(processes)
+    assignments, _, start_times, batch_totals = batch_simulate(sizes, times_needed, *partitions_to_arrays(partitions))
+    started_in = {event[2]: event[3] for event in events if event[0] == "start"}
+    for i, process in enumerate(run_processes):
+        partition_id = started_in.get(process.process_id, -1)
+        if assignments[i] != partition_id:
+            return f"P{process.process_id} assigned to {assignments[i]} where the simulation ran it in {partition_id}"
+        if partition_id >= 0 and not math.isclose(start_times[i], process.start_time, rel_tol=1e-9, abs_tol=1e-9):
+            return f"P{process.process_id} starts at {start_times[i]} where the simulation starts it at {process.start_time}"
+    if not all(math.isclose(total, expected, rel_tol=1e-9, abs_tol=1e-9) for total, expected in zip(batch_totals, totals)):
+        return f"totals {batch_totals} where the simulation has {totals}"
+    return None
+
+
+CHECKS = {
+    "placement": check_placement,
+    "waiting": check_waiting,
+    "dispatch": check_dispatch,
+    "batch": check_batch,
+}
+
+# Which runs the checks limited to some queue modes or arrival settings apply to
+ONLY = {
+    "dispatch": lambda queue_mode, online: queue_mode == "single-largest",
+    "batch": lambda queue_mode, online: queue_mode == "multi" and not online,
+}
+
+
+def verify(seeds: range, process_count: int = 200,
+           checks=tuple(CHECKS)) -> Tuple[int, List[Tuple[str, int, str, bool, str]]]:
+    # The number of checks run, and (check, seed, queue mode, online, message)
+    # for every failure
+    runs = 0
+    failures = []
+    for seed in seeds:
+        for online in (False, True):
+            processes, partitions = workload(seed, process_count, online)
+            for queue_mode in QUEUE_MODES:
+                for name in checks:
+                    if name in ONLY and not ONLY[name](queue_mode, online):
+                        continue
+                    runs += 1
+                    message = CHECKS[name](processes, partitions, queue_mode, online)
+                    if message is not None:
+                        failures.append((name, seed, queue_mode, online, message))
+    return runs, failures
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Check the simulator against reference implementations")
+    parser.add_argument("--seeds", type=int, default=20, help="number of seeded workloads")
+    parser.add_argument("--processes", type=int, default=200, help="processes per workload")
+    parser.add_argument("--checks", nargs="+", choices=list(CHECKS), default=list(CHECKS), help="checks to run")
+    args = parser.parse_args()
+
+    runs, failures = verify(range(args.seeds), args.processes, args.checks)
+    for name, seed, queue_mode, online, message in failures:
+        print(f"{name} failed for seed {seed}, {queue_mode} queue{', online' if online else ''}: {message}")
+    print(f"{runs - len(failures)} of {runs} checks passed")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()